@@ -0,0 +1,70 @@
+import math
+
+# ----------------------------
+# Gale–Church stílusú, hossz-alapú mondatillesztés
+# ----------------------------
+# Magyar / angol karakterarány és szórás-paraméter (Gale & Church: c, s^2)
+LENGTH_RATIO = 1.1
+LENGTH_VARIANCE = 6.8
+
+# Illesztési típusok (angol mondatok, magyar mondatok) és a priorjuk
+BEAD_PRIORS = {
+    (1, 1): 0.89,
+    (2, 1): 0.089,  # két angol mondat egy magyarba olvadt
+    (1, 2): 0.089,  # egy angol mondat két magyarra esett szét
+}
+
+
+def _match_probability(eng_len, hun_len):
+    # Kétoldali valószínűsége annak, hogy a hosszeltérés ekkora vagy nagyobb
+    mean = (eng_len + hun_len / LENGTH_RATIO) / 2 or 1
+    delta = (hun_len - eng_len * LENGTH_RATIO) / math.sqrt(mean * LENGTH_VARIANCE)
+    return 1 - math.erf(abs(delta) / math.sqrt(2))
+
+
+def align_sentences(eng_sentences, hun_sentences):
+    """
+    Dinamikus programozással leképezi a magyar mondatokat az angolokra
+    1:1, 2:1 és 1:2 illesztésekkel, a karakterhosszak alapján.
+
+    Visszatérés: (illesztések, megbízhatóság). Az illesztések listája
+    (angol indexek, magyar indexek) párokból áll. A megbízhatóság a
+    leggyengébb illesztés hossz-valószínűsége (0..1); ha nincs teljes
+    illesztés, ([], 0.0).
+    """
+    n, m = len(eng_sentences), len(hun_sentences)
+    eng_lens = [len(s) for s in eng_sentences]
+    hun_lens = [len(s) for s in hun_sentences]
+
+    # cost[i][j]: az első i angol és j magyar mondat legjobb illesztésének költsége
+    inf = float("inf")
+    cost = [[inf] * (m + 1) for _ in range(n + 1)]
+    back = [[None] * (m + 1) for _ in range(n + 1)]
+    cost[0][0] = 0.0
+    for i in range(n + 1):
+        for j in range(m + 1):
+            if cost[i][j] == inf:
+                continue
+            for (di, dj), prior in BEAD_PRIORS.items():
+                ni, nj = i + di, j + dj
+                if ni > n or nj > m:
+                    continue
+                p = _match_probability(sum(eng_lens[i:ni]), sum(hun_lens[j:nj]))
+                step = -math.log(prior) - math.log(max(p, 1e-12))
+                if cost[i][j] + step < cost[ni][nj]:
+                    cost[ni][nj] = cost[i][j] + step
+                    back[ni][nj] = (i, j, p)
+
+    if cost[n][m] == inf:
+        return [], 0.0
+
+    beads = []
+    confidence = 1.0
+    i, j = n, m
+    while (i, j) != (0, 0):
+        pi, pj, p = back[i][j]
+        beads.append((list(range(pi, i)), list(range(pj, j))))
+        confidence = min(confidence, p)
+        i, j = pi, pj
+    beads.reverse()
+    return beads, confidence
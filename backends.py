@@ -0,0 +1,248 @@
+import collections
+import hashlib
+import queue
+import re
+import threading
+import time
+
+# ----------------------------
+# Fordító backendek
+# ----------------------------
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# szavak; a (több szavas) védett kifejezés egyetlen tokennek számít
+WORD = re.compile(r"§[^§]*§\S*|\S+")
+
+
+class TranslatorBackend:
+    """
+    Közös felület a fordítókhoz: védett (§...§) szövegek listája be,
+    ugyanannyi fordítás ugyanabban a sorrendben ki. A version a fordítási
+    memória kulcsába kerül, így eltérő backendek eredményei nem keverednek.
+    """
+
+    name = "base"
+    needs_argos_model = False
+
+    def __init__(self):
+        self.calls = 0  # backend hívások (kötegek) száma
+        self.chunks = 0  # lefordított szövegek száma
+        self.chars = 0  # a backendnek küldött karakterek száma
+        self.memo_hits = 0  # mondatszintű memóból, dekódolás nélkül kiszolgált mondatok
+
+    @property
+    def version(self):
+        return self.name
+
+    def translate_batch(self, protected_chunks):
+        self.calls += 1
+        self.chunks += len(protected_chunks)
+        self.chars += sum(len(chunk) for chunk in protected_chunks)
+        return self._translate_batch(protected_chunks)
+
+    def _translate_batch(self, protected_chunks):
+        raise NotImplementedError
+
+
+class FakeBackend(TranslatorBackend):
+    """
+    Determinisztikus álfordító benchmarkhoz és CI-hoz, modell és hálózat nélkül.
+
+    - expansion: a kimenet hossza / bemenet hossza (a magyar szöveg hosszabb)
+    - latency_per_char: szimulált modellidő másodpercben, karakterenként
+    - merge_rate / split_rate: mondatonkénti esély, hogy a "fordítás" két
+      mondatot összevon, illetve egy mondatot kettévág (mondatszám-eltérés)
+
+    Ugyanarra a bemenetre mindig ugyanazt adja (a döntések a szöveg
+    hash-éből jönnek, nem véletlenszám-generátorból).
+    """
+
+    name = "fake"
+
+    def __init__(self, expansion=1.15, latency_per_char=0.0, merge_rate=0.05, split_rate=0.05):
+        super().__init__()
+        self.expansion = expansion
+        self.latency_per_char = latency_per_char
+        self.merge_rate = merge_rate
+        self.split_rate = split_rate
+
+    @property
+    def version(self):
+        return f"fake-{self.expansion}-{self.merge_rate}-{self.split_rate}"
+
+    @staticmethod
+    def _chance(text, salt):
+        # Determinisztikus "véletlen" szám [0, 1) között
+        digest = hashlib.blake2b(f"{salt}:{text}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2 ** 64
+
+    def _fake_word(self, word):
+        # A védett kifejezések változatlanok, a többi szó "magyarosodik"
+        if not word[:1].isalpha():
+            return word
+        stripped = word.rstrip(".,!?;:")
+        tail = word[len(stripped):]
+        extra = max(0, round(len(stripped) * (self.expansion - 1)))
+        suffix = ("ek" * (extra // 2 + 1))[:extra]
+        return stripped + suffix + tail
+
+    def _fake_sentence(self, sentence):
+        words = [self._fake_word(w) for w in WORD.findall(sentence)]
+        if len(words) >= 6 and self._chance(sentence, "split") < self.split_rate:
+            mid = len(words) // 2
+            words[mid - 1] = words[mid - 1].rstrip(",;:") + "."
+            words[mid] = words[mid][:1].upper() + words[mid][1:]
+        return " ".join(words)
+
+    def _translate_one(self, chunk):
+        sentences = [s for s in SENTENCE_END.split(chunk.strip()) if s]
+        out = []
+        for i, sentence in enumerate(sentences):
+            translated = self._fake_sentence(sentence)
+            if out and self._chance(sentences[i - 1] + sentence, "merge") < self.merge_rate:
+                # az előző mondat záró írásjele vesszővé válik
+                out[-1] = out[-1][:-1] + "," if out[-1][-1:] in ".!?" else out[-1]
+                translated = translated[:1].lower() + translated[1:]
+                out[-1] = out[-1] + " " + translated
+            else:
+                out.append(translated)
+        return " ".join(out)
+
+    def _translate_batch(self, protected_chunks):
+        if self.latency_per_char:
+            time.sleep(self.latency_per_char * sum(len(c) for c in protected_chunks))
+        return [self._translate_one(chunk) for chunk in protected_chunks]
+
+
+class _PendingSubmission:
+    # Egy kérés chunkjai a kötegelő sorában, az eredményre váró szállal
+    __slots__ = ("chunks", "enqueued", "done", "result", "error")
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BatchingBackend(TranslatorBackend):
+    """
+    Kérések közötti dinamikus kötegelés (szerver mód). A kéréskezelő szálak
+    chunkjai egy sorba kerülnek; egy ütemező szál a legrégebbi várakozótól
+    számítva legfeljebb max_wait másodpercig gyűjt, vagy amíg össze nem jön
+    max_batch_chunks chunk, majd az egészet egyetlen hívással a belső
+    backendnek adja, és az eredményeket sorrendben visszaosztja. Egy kérés
+    chunkjai mindig együtt maradnak: amelyik beküldés már nem férne a kötegbe,
+    az a következő köteg elejére kerül, a max_batch_chunks-nál nagyobb
+    beküldés pedig egyedül megy.
+
+    Mérőszámok (metrics()): kötegszám, átlagos kötegtöltöttség (csak egyedül
+    menő, túl nagy beküldésnél lehet 1 fölött), a sorban töltött idő (átlag,
+    p50, p95, max) az utolsó METRICS_WINDOW kötegre.
+    """
+
+    name = "batching"
+    METRICS_WINDOW = 1000
+
+    def __init__(self, inner, max_batch_chunks=64, max_wait=0.005):
+        super().__init__()
+        self.inner = inner
+        self.needs_argos_model = inner.needs_argos_model
+        self.max_batch_chunks = max_batch_chunks
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._held = None  # a legutóbbi kötegbe már nem fért beküldés (csak az ütemező szál használja)
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._submissions = 0
+        self._batched_chunks = 0
+        self._fills = collections.deque(maxlen=self.METRICS_WINDOW)
+        self._queue_latencies = collections.deque(maxlen=self.METRICS_WINDOW)
+        self._scheduler = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+        self._scheduler.start()
+
+    @property
+    def version(self):
+        return self.inner.version
+
+    def _translate_batch(self, protected_chunks):
+        if not protected_chunks:
+            return []
+        submission = _PendingSubmission(list(protected_chunks))
+        self._queue.put(submission)
+        submission.done.wait()
+        if submission.error is not None:
+            raise submission.error
+        return submission.result
+
+    def _run(self):
+        while True:
+            first = self._held if self._held is not None else self._queue.get()
+            self._held = None
+            batch = [first]
+            size = len(first.chunks)
+            deadline = first.enqueued + self.max_wait
+            while size < self.max_batch_chunks:
+                timeout = deadline - time.perf_counter()
+                try:
+                    # a már várakozókat lejárt határidő után is felvesszük
+                    submission = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if size + len(submission.chunks) > self.max_batch_chunks:
+                    self._held = submission  # nem fér bele: a következő köteget kezdi
+                    break
+                batch.append(submission)
+                size += len(submission.chunks)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        started = time.perf_counter()
+        chunks = [chunk for submission in batch for chunk in submission.chunks]
+        try:
+            results = self.inner.translate_batch(chunks)
+        except Exception as e:  # a hibát minden várakozó kérés megkapja
+            for submission in batch:
+                submission.error = e
+                submission.done.set()
+            return
+
+        with self._metrics_lock:
+            self._batches += 1
+            self._submissions += len(batch)
+            self._batched_chunks += len(chunks)
+            self._fills.append(len(chunks) / self.max_batch_chunks)
+            self._queue_latencies.extend(started - submission.enqueued for submission in batch)
+
+        position = 0
+        for submission in batch:
+            submission.result = results[position:position + len(submission.chunks)]
+            position += len(submission.chunks)
+            submission.done.set()
+
+    def metrics(self):
+        with self._metrics_lock:
+            fills = list(self._fills)
+            latencies = sorted(self._queue_latencies)
+            batches, submissions, chunks = self._batches, self._submissions, self._batched_chunks
+
+        def percentile(q):
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+
+        return {
+            "max_batch_chunks": self.max_batch_chunks,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": batches,
+            "submissions": submissions,
+            "chunks": chunks,
+            "avg_submissions_per_batch": submissions / batches if batches else 0.0,
+            "avg_batch_chunks": chunks / batches if batches else 0.0,
+            "avg_batch_fill": sum(fills) / len(fills) if fills else 0.0,
+            "queue_latency_ms": {
+                "avg": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": latencies[-1] * 1000 if latencies else 0.0,
+            },
+            "queued": self._queue.qsize() + (self._held is not None),
+        }
@@ -0,0 +1,70 @@
+"""
+Import-idő benchmark (python -X importtime alapján).
+
+Többször, friss interpreterben importálja a main modult, és kiírja a
+kumulatív import-időt. Hibakóddal lép ki, ha a medián átlépi a keretet,
+vagy ha import közben betöltődik valamelyik nehéz függőség - így CI-ban
+ellenőrzésként is futtatható.
+
+Használat:
+    python benchmarks/bench_import_time.py --runs 5 --budget-ms 150
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("argostranslate", "ctranslate2", "sentencepiece", "stanza", "nltk", "torch")
+
+
+def measure_import(module):
+    # Visszatérés: (a modul kumulatív import-ideje µs-ben, betöltött modulok nevei)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative_us = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        loaded.add(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    timings = []
+    heavy = set()
+    for _ in range(args.runs):
+        cumulative_us, loaded = measure_import(args.module)
+        timings.append(cumulative_us / 1000)
+        heavy |= {name for name in loaded if name.split(".")[0] in HEAVY_MODULES}
+
+    median_ms = statistics.median(timings)
+    print(f"import {args.module}: medián {median_ms:.1f} ms "
+          f"(min {min(timings):.1f}, max {max(timings):.1f}, {args.runs} futás)")
+
+    failed = False
+    if heavy:
+        print(f"HIBA: import közben betöltött nehéz modulok: {', '.join(sorted(heavy))}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"HIBA: a medián import-idő túllépi a keretet ({args.budget_ms:.0f} ms)")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
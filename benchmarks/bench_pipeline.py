@@ -0,0 +1,138 @@
+"""
+Szakaszonkénti pipeline benchmark szintetikus SRT fájlokon.
+
+Minden méretre (alapból 1k, 10k és 100k blokk) generál egy fájlt, és méri
+a beolvasás, mondatszegmentálás, chunkolás, védés, fordítás (determinisztikus
+FakeBackend-del, modell nélkül), visszaosztás, formázás és kiírás idejét,
+a szakaszonkénti memóriacsúcsot és a fordítóhívások számát. Az eredmény
+JSON-ba kerül, a konzolra pedig a skálázódási táblázat: blokkonkénti idő
+méretenként, és a becsült kitevő (≈1.0 = lineáris).
+
+Használat:
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 100000 --json bench.json
+"""
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+from backends import FakeBackend  # noqa: E402
+from instrumentation import RunStats  # noqa: E402
+from generate_srt import generate_srt  # noqa: E402
+
+STAGES = ["read", "segment", "chunk", "protect", "translate", "distribute", "format", "write"]
+
+
+def run_pipeline(srt_path, out_path, backend, measure_memory=False):
+    """Egy teljes futás; visszatérés: {szakasz: {"seconds": ..., "peak_bytes": ...}}."""
+    results = {}
+    state = {}
+    run_stats = RunStats(timing=False)
+
+    def stage(name, fn):
+        if measure_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        value = fn()
+        results[name] = {"seconds": time.perf_counter() - start}
+        if measure_memory:
+            results[name]["peak_bytes"] = tracemalloc.get_traced_memory()[1] - base
+        return value
+
+    blocks = stage("read", lambda: main.read_srt(srt_path))
+    sentences, sentence_blocks = stage("segment", lambda: main.segment_transcript(blocks))
+    chunks = stage("chunk", lambda: main.plan_chunks(sentences))
+    stage("protect", lambda: [main.protect_terms(" ".join(sentences[a:b])) for a, b in chunks])
+    state["hun"] = stage("translate", lambda: main.translate_sentences(sentences, run_stats))
+    parts = stage("distribute", lambda: main.distribute_sentences(len(blocks), sentence_blocks, state["hun"]))
+    texts = stage("format", lambda: main.format_srt_blocks(" ".join(p) for p in parts))
+    stage("write", lambda: main.write_srt(
+        [{"index": b["index"], "timestamp": b["timestamp"], "text": t} for b, t in zip(blocks, texts)],
+        out_path))
+
+    results["_counts"] = {
+        "blocks": len(blocks),
+        "sentences": len(sentences),
+        "chunks": len(chunks),
+        "translator_calls": backend.calls,
+        "translator_chunks": backend.chunks,
+        "translator_chars": backend.chars,
+        **run_stats.counters,
+    }
+    return results
+
+
+def scaling_exponent(sizes, seconds):
+    # log-log meredekség az első és utolsó méret között
+    if len(sizes) < 2 or seconds[0] <= 0 or seconds[-1] <= 0:
+        return None
+    return math.log(seconds[-1] / seconds[0]) / math.log(sizes[-1] / sizes[0])
+
+
+def main_bench():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-per-char", type=float, default=0.0,
+                        help="FakeBackend szimulált modellideje karakterenként (s)")
+    parser.add_argument("--no-memory", action="store_true", help="memóriacsúcs mérésének kihagyása")
+    parser.add_argument("--json", default="bench_pipeline.json")
+    args = parser.parse_args()
+
+    main.TRANSLATION_MEMORY_PATH = None  # a fordítási memória ne torzítsa a mérést
+    report = {"sizes": args.sizes, "runs": {}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            srt_path = Path(tmp) / f"synthetic_{size}.srt"
+            srt_path.write_text(generate_srt(size, args.seed), encoding="utf-8")
+            out_path = Path(tmp) / f"synthetic_{size}.hun.srt"
+
+            backend = main.set_translator_backend(FakeBackend(latency_per_char=args.latency_per_char))
+            run = run_pipeline(srt_path, out_path, backend)
+            if not args.no_memory:
+                # külön futás memóriaméréssel, hogy a tracemalloc ne lassítsa az időméréseket
+                main.set_translator_backend(FakeBackend(latency_per_char=args.latency_per_char))
+                tracemalloc.start()
+                memory_run = run_pipeline(srt_path, out_path, main.get_translator_backend(), True)
+                tracemalloc.stop()
+                for name in STAGES:
+                    run[name]["peak_bytes"] = memory_run[name]["peak_bytes"]
+            report["runs"][size] = run
+
+            counts = run["_counts"]
+            print(f"\n=== {size} blokk ({counts['sentences']} mondat, {counts['chunks']} chunk, "
+                  f"{counts['translator_calls']} fordítóhívás, {counts['translator_chunks']} chunk) ===")
+            for name in STAGES:
+                peak = run[name].get("peak_bytes")
+                peak_text = f"{peak / 2 ** 20:8.1f} MiB" if peak is not None else ""
+                print(f"  {name:<11} {run[name]['seconds'] * 1000:10.1f} ms  {peak_text}")
+
+    # Skálázódás: blokkonkénti idő méretenként és a becsült kitevő
+    report["scaling"] = {}
+    print("\n=== SKÁLÁZÓDÁS (µs / blokk, kitevő ≈ 1.0 lineáris) ===")
+    print(f"  {'szakasz':<11}" + "".join(f"{size:>12}" for size in args.sizes) + "     kitevő")
+    for name in STAGES:
+        seconds = [report["runs"][size][name]["seconds"] for size in args.sizes]
+        exponent = scaling_exponent(args.sizes, seconds)
+        report["scaling"][name] = {"us_per_block": [s / n * 1e6 for s, n in zip(seconds, args.sizes)],
+                                   "exponent": exponent}
+        exponent_text = f"{exponent:10.2f}" if exponent is not None else "         -"
+        print(f"  {name:<11}" + "".join(f"{s / n * 1e6:12.2f}" for s, n in zip(seconds, args.sizes))
+              + exponent_text)
+
+    Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nJSON riport: {args.json}")
+
+
+if __name__ == "__main__":
+    main_bench()
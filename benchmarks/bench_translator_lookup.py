@@ -0,0 +1,56 @@
+"""
+Mikro-benchmark: mennyibe kerül hívásonként a fordító kikeresése.
+
+Összeveti az argostranslate.translate.translate() hívást (minden hívásnál
+újra listázza a nyelveket és feloldja az en->hu párt) a main.py-ban egyszer
+feloldott és tárolt modell közvetlen hívásával.
+
+Használat:
+    python benchmarks/bench_translator_lookup.py --calls 50
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import argostranslate.translate  # noqa: E402
+
+import main  # noqa: E402
+
+SAMPLE = "Okay. Let's get started."
+
+
+def per_call_ms(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def main_bench():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    main.ensure_argos_model()
+    main.TRANSLATION_MEMORY_PATH = None  # a memória ne torzítsa a mérést
+
+    lookup_ms = per_call_ms(lambda: argostranslate.translate.get_translation_from_codes("en", "hu"),
+                            args.calls)
+    argos_ms = per_call_ms(lambda: argostranslate.translate.translate(SAMPLE, "en", "hu"), args.calls)
+
+    main.load_argos_model()  # bemelegítés: az első hívás tölti be a modellt
+    cached_lookup_ms = per_call_ms(main.load_argos_model, args.calls)
+    cached_ms = per_call_ms(lambda: main.translate_protected_batch([SAMPLE]), args.calls)
+
+    print(f"Hívások száma: {args.calls}")
+    print(f"Pár feloldása (argos, hívásonként):    {lookup_ms:8.3f} ms")
+    print(f"Pár feloldása (tárolt):                {cached_lookup_ms:8.3f} ms")
+    print(f"Fordítás argostranslate.translate():  {argos_ms:8.3f} ms")
+    print(f"Fordítás tárolt modellel:              {cached_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,92 @@
+"""
+Szintetikus angol SRT generátor benchmarkokhoz.
+
+Tech-kurzus jellegű mondatokat gyárt (glosszárium kifejezésekkel, ismétlődő
+fordulatokkal), és a szöveget feliratblokkokra tördeli úgy, hogy a mondatok
+gyakran átnyúljanak a blokkhatárokon - mint a valódi átiratokban.
+
+Használat:
+    python benchmarks/generate_srt.py 10000 synthetic_10k.srt --seed 1
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import EXCEPTIONS  # noqa: E402
+
+STOCK_PHRASES = [
+    "Okay.", "Let's get started.", "See you in the next video.", "Alright.",
+    "So let's take a look.", "That's it for this lecture.", "Let's jump right in.",
+]
+SUBJECTS = ["we", "you", "the framework", "this component", "our application", "the compiler",
+            "the browser", "the server", "the team", "this function"]
+VERBS = ["install", "configure", "deploy", "refactor", "render", "compile", "test", "debug",
+         "import", "export", "optimize", "update"]
+OBJECTS = ["the project", "a new module", "the routing layer", "the state", "the database schema",
+           "all of the dependencies", "a small helper", "the build pipeline", "the user interface"]
+TAILS = ["step by step", "from the terminal", "in the next section", "right now",
+         "before we move on", "so that it scales", "without any surprises", "in production"]
+
+
+def make_sentence(rng):
+    if rng.random() < 0.2:
+        return rng.choice(STOCK_PHRASES)
+    parts = [rng.choice(SUBJECTS).capitalize(), "will", rng.choice(VERBS), rng.choice(OBJECTS)]
+    if rng.random() < 0.5:
+        parts += ["with", rng.choice(EXCEPTIONS)]
+    if rng.random() < 0.4:
+        parts += [rng.choice(["and", "because", "so"]), rng.choice(SUBJECTS), rng.choice(VERBS),
+                  rng.choice(OBJECTS)]
+    parts.append(rng.choice(TAILS))
+    return " ".join(parts) + rng.choice([".", ".", ".", "?", "!"])
+
+
+def format_timestamp(ms):
+    h, ms = divmod(ms, 3_600_000)
+    m, ms = divmod(ms, 60_000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def generate_srt(num_blocks, seed=0, max_block_chars=84):
+    """A num_blocks blokkos SRT szövegét adja vissza (determinisztikusan, seed alapján)."""
+    rng = random.Random(seed)
+    words = []
+    out = []
+    start_ms = 0
+    for index in range(1, num_blocks + 1):
+        # Annyi szót veszünk, amennyi belefér a blokkba; a mondatvég nem számít
+        block_words = []
+        length = 0
+        while True:
+            if not words:
+                words = make_sentence(rng).split()
+            if block_words and length + 1 + len(words[0]) > max_block_chars:
+                break
+            length += len(words[0]) + (1 if block_words else 0)
+            block_words.append(words.pop(0))
+        text = " ".join(block_words)
+        # két sorra törés nagyjából középen, mint egy valódi feliratban
+        if len(block_words) > 3:
+            mid = len(block_words) // 2
+            text = " ".join(block_words[:mid]) + "\n" + " ".join(block_words[mid:])
+        duration = 1200 + length * 40
+        out.append(f"{index}\n{format_timestamp(start_ms)} --> {format_timestamp(start_ms + duration)}\n{text}\n")
+        start_ms += duration + 80
+    return "\n".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("blocks", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    Path(args.output).write_text(generate_srt(args.blocks, args.seed), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
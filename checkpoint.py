@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# ----------------------------
+# Ellenőrzőpont a fordítási ciklushoz (megszakadt futás folytatása)
+# ----------------------------
+CHECKPOINT_VERSION = 2
+
+# Fájlformátum: JSON sorok. Az első sor a fejléc (verzió, konfiguráció hash),
+# utána ablakonként egy sor csak az abban elfogadott chunkokkal és a következő
+# mondatindexszel. Így egy ellenőrzőpont költsége az ablak méretével arányos,
+# nem a fájl eddigi hosszával. Egy megszakadt írás legfeljebb egy csonka
+# utolsó sort hagy, ezt betöltéskor levágjuk.
+
+
+def config_hash(sentences, **settings):
+    """
+    A futás "konfigurációjának" hash-e: a forrásmondatok és minden beállítás,
+    ami a fordítást befolyásolja (backend verzió, glosszárium, chunk méretek).
+    Eltérő hash esetén a régi ellenőrzőpontot nem használjuk.
+    """
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    for sentence in sentences:
+        digest.update(sentence.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_checkpoint(checkpoint_path, expected_hash):
+    """
+    Visszatérés: (következő mondatindex, {kezdő index: (vég index, ujjlenyomat, magyar mondatok)}),
+    vagy None, ha nincs használható ellenőrzőpont. Egy csonka utolsó sort
+    levágunk a fájlról, hogy a folytatás utáni hozzáfűzések olvashatók maradjanak.
+    """
+    try:
+        with open(checkpoint_path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    lines = raw.split(b"\n")
+    try:
+        header = json.loads(lines[0])
+    except ValueError:
+        return None
+    if header.get("version") != CHECKPOINT_VERSION or header.get("config_hash") != expected_hash:
+        return None
+
+    next_index = 0
+    chunks = {}
+    valid_bytes = len(lines[0]) + 1
+    for line in lines[1:-1]:  # az utolsó elem a záró \n utáni rész: üres vagy csonka
+        try:
+            record = json.loads(line)
+        except ValueError:
+            break
+        next_index = record["next_index"]
+        for start, end, chunk_fp, hun in record["chunks"]:
+            chunks[start] = (end, chunk_fp, hun)
+        valid_bytes += len(line) + 1
+    if valid_bytes < len(raw):
+        with open(checkpoint_path, "r+b") as f:
+            f.truncate(valid_bytes)
+    return next_index, chunks
+
+
+def start_checkpoint(checkpoint_path, config_digest):
+    # Új ellenőrzőpont fejléccel; atomikus csere (ideiglenes fájl + os.replace)
+    checkpoint_path = Path(checkpoint_path)
+    tmp = checkpoint_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": CHECKPOINT_VERSION, "config_hash": config_digest}) + "\n",
+                   encoding="utf-8")
+    os.replace(tmp, checkpoint_path)
+
+
+def append_checkpoint(checkpoint_path, next_index, new_chunks):
+    """
+    Egy ablak eredményének hozzáfűzése egyetlen sorként (egy write hívással).
+    new_chunks: {kezdő index: (vég index, ujjlenyomat, magyar mondatok)}, csak az új chunkok.
+    """
+    record = {
+        "next_index": next_index,
+        "chunks": [[start, end, chunk_fp, hun] for start, (end, chunk_fp, hun) in sorted(new_chunks.items())],
+    }
+    with open(checkpoint_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def remove_checkpoint(checkpoint_path):
+    try:
+        os.remove(checkpoint_path)
+    except FileNotFoundError:
+        pass
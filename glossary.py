@@ -0,0 +1,131 @@
+import collections
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+# ----------------------------
+# Glosszárium illesztő (védett kifejezések)
+# ----------------------------
+NEVER_MATCHES = re.compile(r"(?!)")
+
+
+def _trie_pattern(node):
+    # Egy prefix-fa csomópontjából regex: a gyerekek első karaktere különböző,
+    # így nincs visszalépés az ágak között; a "szó vége" jelölés mohó "?"-lel
+    # kerül a végére, ezért mindig a leghosszabb egyezés nyer.
+    alternatives = [re.escape(ch) + _trie_pattern(child)
+                    for ch, child in sorted(node.items()) if ch != ""]
+    if not alternatives:
+        return ""
+    body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if "" in node:
+        return "(?:" + body + ")?"
+    return body
+
+
+def compile_glossary(terms):
+    """
+    A kifejezéslistából egyetlen, prefix-fára épülő regexet fordít.
+    Egy balról jobbra haladó menetben találja meg a leghosszabb egyezést
+    minden pozícióban, így pl. a "React Native"-en belül a "React", vagy a
+    "GitHub"-on belül a "Git" nem kap külön jelölést.
+    """
+    trie = {}
+    for term in terms:
+        if not term:
+            continue
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    if not trie:
+        return NEVER_MATCHES
+    return re.compile(_trie_pattern(trie))
+
+
+# ----------------------------
+# Glosszárium fájlok és lemezen tárolt illesztők
+# ----------------------------
+GLOSSARY_FILE_NAMES = ("glossary.txt", "glossary.toml")
+
+MATCHER_CACHE_SIZE = 128  # ennyi lefordított illesztőt tartunk meg folyamaton belül (LRU)
+
+_matchers = collections.OrderedDict()  # tartalom-hash -> lefordított regex
+_matchers_lock = threading.Lock()  # a szerver kéréskezelő szálai közösen használják
+
+
+def load_glossary_file(path):
+    """
+    Kifejezések beolvasása. TOML esetén a `terms = [...]` lista, szöveges
+    fájlnál soronként egy kifejezés (üres és #-tel kezdődő sorok kihagyva).
+    """
+    path = Path(path)
+    if path.suffix == ".toml":
+        import tomllib  # Python 3.11+, csak TOML glosszáriumhoz kell
+        with open(path, "rb") as f:
+            return list(tomllib.load(f).get("terms", []))
+    terms = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            terms.append(line)
+    return terms
+
+
+def merge_glossaries(*term_lists):
+    # Sorrendtartó, ismétlés nélküli összefésülés
+    return list(dict.fromkeys(term for terms in term_lists for term in terms))
+
+
+def find_directory_glossaries(directory, root):
+    """
+    A directory-tól felfelé a root-ig (azt is beleértve) talált glosszárium
+    fájlok, a legkülsőtől a legbelsőig.
+    """
+    directory, root = Path(directory).resolve(), Path(root).resolve()
+    found = []
+    while True:
+        for name in GLOSSARY_FILE_NAMES:
+            if (directory / name).is_file():
+                found.append(directory / name)
+        if directory == root or directory.parent == directory:
+            break
+        directory = directory.parent
+    return list(reversed(found))
+
+
+def get_matcher(terms, cache_dir=None):
+    """
+    Illesztő a kifejezéslistához. A lefordított mintát a tartalom hash-ével
+    kulcsolva a cache_dir-ben tároljuk, így nagy glosszáriumnál nem kell
+    minden indításkor újraépíteni a prefix-fát. Kérésenkénti (egyszeri)
+    kifejezéslistákhoz cache_dir=None: ezek ne szemeteljék tele a lemezt.
+    Folyamaton belül a legutóbb használt MATCHER_CACHE_SIZE illesztő marad meg.
+    """
+    unique = sorted(set(terms))
+    digest = hashlib.sha256("\n".join(unique).encode("utf-8")).hexdigest()
+    with _matchers_lock:
+        if digest in _matchers:
+            _matchers.move_to_end(digest)
+            return _matchers[digest]
+
+    cache_file = Path(cache_dir) / f"{digest}.json" if cache_dir is not None else None
+    if cache_file is not None and cache_file.exists():
+        matcher = re.compile(json.loads(cache_file.read_text(encoding="utf-8"))["pattern"])
+    else:
+        matcher = compile_glossary(unique)
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # atomikus csere, hogy párhuzamos munkafolyamatok (és a szerver
+            # kéréskezelő szálai) ne lássanak félkész fájlt
+            tmp = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps({"pattern": matcher.pattern}), encoding="utf-8")
+            os.replace(tmp, cache_file)
+    with _matchers_lock:
+        _matchers[digest] = matcher
+        while len(_matchers) > MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    return matcher
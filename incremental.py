@@ -0,0 +1,120 @@
+import difflib
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# ----------------------------
+# Inkrementális újrafordítás: az előző futás chunkjai egy állapotfájlban
+# ----------------------------
+STATE_VERSION = 1
+DIFF_AUTOJUNK_MIN = 2000  # ennél hosszabb eltérő szakaszon a difflib autojunk-kal fut
+
+
+def fingerprint(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_state(state_path, model_version):
+    """
+    Az előző futás állapota, vagy None, ha nincs, sérült, vagy más
+    modellel / backenddel készült (akkor minden chunkot újrafordítunk).
+    """
+    try:
+        state = json.loads(Path(state_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if state.get("version") != STATE_VERSION or state.get("model_version") != model_version:
+        return None
+    return state
+
+
+def save_state(state_path, model_version, sentences, chunks):
+    """
+    chunks: (kezdő index, vég index, chunk ujjlenyomat, magyar mondatok) sorok.
+    A mondatokból csak a hash kerül a fájlba, az illesztéshez ennyi elég.
+    """
+    state_path = Path(state_path)
+    state = {
+        "version": STATE_VERSION,
+        "model_version": model_version,
+        "sentences": [fingerprint(sentence) for sentence in sentences],
+        "chunks": [{"start": start, "end": end, "fingerprint": chunk_fp, "hun": hun}
+                   for start, end, chunk_fp, hun in chunks],
+    }
+    tmp = state_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, state_path)
+
+
+def _match_hashes(old_hashes, new_hashes):
+    """
+    Az egyező (régi index, új index) párok. A közös elejét és végét lineárisan
+    vágjuk le, a difflib csak a köztes, eltérő szakaszon fut. Hosszú köztes
+    szakaszon az autojunk bekapcsolva marad: ismétlődő átiratokon (sok "Okay.")
+    e nélkül a SequenceMatcher szuperlineáris; a gyakori mondatok az egyedi
+    horgonyok melletti illesztés-kiterjesztéssel így is párosulnak.
+    """
+    limit = min(len(old_hashes), len(new_hashes))
+    prefix = 0
+    while prefix < limit and old_hashes[prefix] == new_hashes[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_hashes[-1 - suffix] == new_hashes[-1 - suffix]:
+        suffix += 1
+
+    pairs = [(i, i) for i in range(prefix)]
+    old_middle = old_hashes[prefix:len(old_hashes) - suffix]
+    new_middle = new_hashes[prefix:len(new_hashes) - suffix]
+    if old_middle and new_middle:
+        matcher = difflib.SequenceMatcher(None, old_middle, new_middle,
+                                          autojunk=len(new_middle) > DIFF_AUTOJUNK_MIN)
+        for old_start, new_start, size in matcher.get_matching_blocks():
+            pairs.extend((prefix + old_start + k, prefix + new_start + k) for k in range(size))
+    old_tail, new_tail = len(old_hashes) - suffix, len(new_hashes) - suffix
+    pairs.extend((old_tail + k, new_tail + k) for k in range(suffix))
+    return pairs
+
+
+def match_previous_chunks(state, sentences, chunk_fingerprint):
+    """
+    Az előző futás chunkjai közül azok, amelyek változatlanul megvannak az új
+    mondatlistában. A mondatokat hash alapján illesztjük (difflib), így a
+    beszúrt vagy törölt mondatok után is megtaláljuk az eltolódott chunkokat.
+    Egy chunk akkor használható újra, ha minden mondata egymás után illeszkedik,
+    és a védett szövegének ujjlenyomata (chunk_fingerprint(start, end)) sem
+    változott - így a glosszárium módosítása is újrafordítást vált ki.
+    Visszatérés: {új kezdő index: (új vég index, ujjlenyomat, magyar mondatok)}.
+    """
+    old_hashes = state["sentences"]
+    new_hashes = [fingerprint(sentence) for sentence in sentences]
+    old_to_new = {}
+    for old_index, new_index in _match_hashes(old_hashes, new_hashes):
+        old_to_new[old_index] = new_index
+
+    reused = {}
+    for chunk in state["chunks"]:
+        start, end = chunk["start"], chunk["end"]
+        new_start = old_to_new.get(start)
+        if new_start is None or new_start in reused:
+            continue
+        if any(old_to_new.get(i) != new_start + i - start for i in range(start + 1, end)):
+            continue
+        new_end = new_start + end - start
+        if chunk_fingerprint(new_start, new_end) != chunk["fingerprint"]:
+            continue
+        reused[new_start] = (new_end, chunk["fingerprint"], chunk["hun"])
+    return reused
+
+
+def uncovered_ranges(num_sentences, covered):
+    # covered: {kezdő index: (vég index, ...)} -> a lefedetlen (kezdő, vég) szakaszok
+    ranges = []
+    position = 0
+    for start in sorted(covered):
+        if start > position:
+            ranges.append((position, start))
+        position = max(position, covered[start][0])
+    if position < num_sentences:
+        ranges.append((position, num_sentences))
+    return ranges
@@ -0,0 +1,63 @@
+import contextlib
+import json
+import time
+from pathlib import Path
+
+# ----------------------------
+# Szakaszonkénti időmérés és számlálók
+# ----------------------------
+_NO_TIMING = contextlib.nullcontext()
+
+
+class RunStats:
+    """
+    Egy futás (vagy több futás összesített) mérőszámai: szakaszonkénti
+    idők másodpercben és egész számlálók. Kikapcsolt időmérésnél a stage()
+    egy közös, üres context managert ad vissza, így a mérés szinte ingyenes.
+    A számlálók mindig működnek (chunkonként egy dict-növelés).
+    """
+
+    def __init__(self, timing=True):
+        self.timing = timing
+        self.timings = {}
+        self.counters = {}
+
+    def stage(self, name):
+        if not self.timing:
+            return _NO_TIMING
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def get(self, name):
+        return self.counters.get(name, 0)
+
+    def merge(self, other):
+        # other: RunStats vagy az as_dict() kimenete (pl. munkafolyamatból)
+        if isinstance(other, RunStats):
+            other = other.as_dict()
+        for name, seconds in other["timings"].items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for name, value in other["counters"].items():
+            self.count(name, value)
+        return self
+
+    def as_dict(self):
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+    def write_json(self, path):
+        Path(path).write_text(json.dumps(self.as_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def format_timings(self):
+        total = sum(self.timings.values()) or 1.0
+        return "\n".join(f"  {name:<13} {seconds:8.3f} s ({seconds / total * 100:5.1f}%)"
+                         for name, seconds in self.timings.items())
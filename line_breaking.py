@@ -0,0 +1,42 @@
+# ----------------------------
+# Kétsoros feliratsor-tördelés, lineáris időben
+# ----------------------------
+def break_two_lines(text, max_chars_per_line, shorter_first=True):
+    """
+    A szöveget legfeljebb két sorba tördeli a legkiegyensúlyozottabb szóhatáron.
+    A szóhosszak prefix-összegeiből minden töréspont sorhossza O(1)-ben
+    számolható, így az egész O(n) a szavak számában.
+
+    - Ha a szöveg elfér egy sorban, egy sor marad.
+    - A szabályos (mindkét sor <= max_chars_per_line) töréspontok közül a
+      legkisebb hosszkülönbségű nyer; egyenlőségnél (shorter_first esetén)
+      az, ahol az első sor a rövidebb.
+    - Ha nincs szabályos töréspont, a hosszabbik sort minimalizáljuk.
+    """
+    words = text.split()
+    if not words:
+        return ""
+    text = " ".join(words)
+    if len(text) <= max_chars_per_line or len(words) == 1:
+        return text
+
+    # prefix[i] = az első i szó hossza (szóközök nélkül)
+    prefix = [0]
+    for word in words:
+        prefix.append(prefix[-1] + len(word))
+    total = len(text)
+
+    best_key = None
+    best_i = 1
+    for i in range(1, len(words)):
+        first_len = prefix[i] + i - 1
+        second_len = total - first_len - 1
+        legal = first_len <= max_chars_per_line and second_len <= max_chars_per_line
+        longer_first = first_len > second_len if shorter_first else first_len < second_len
+        key = (not legal, abs(first_len - second_len) if legal else max(first_len, second_len),
+               longer_first)
+        if best_key is None or key < best_key:
+            best_key = key
+            best_i = i
+
+    return " ".join(words[:best_i]) + "\n" + " ".join(words[best_i:])
@@ -1,21 +1,29 @@
+import argparse
+import contextlib
+import contextvars
+import glob
+import hashlib
+import io
+import itertools
+import json
+import logging
 import os
-import tempfile
-import urllib.request
+import time
 from pathlib import Path
 
-import argostranslate.package
-import argostranslate.translate
-import nltk
-from nltk.data import find
-from nltk.tokenize import sent_tokenize
+from alignment import align_sentences
+from backends import FakeBackend, TranslatorBackend
+import checkpoint
+from glossary import compile_glossary, find_directory_glossaries, get_matcher, load_glossary_file, merge_glossaries
+import incremental
+from instrumentation import RunStats
+from line_breaking import break_two_lines
+from structured_logging import LOGGER_NAME, make_formatter, setup_logging
+from translation_memory import SentenceMemo, TranslationMemory
 
-# ----------------------------
-# NLTK punkt biztosítása
-# ----------------------------
-try:
-    find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+# A nehéz függőségek (argostranslate, ctranslate2, sentencepiece, nltk)
+# csak a fordítás tényleges indulásakor töltődnek be, hogy a --help, a
+# tesztek és a benchmarkok importja gyors és hálózatmentes maradjon.
 
 # ----------------------------
 # Konfiguráció
@@ -26,65 +34,733 @@ EXCEPTIONS = [
     "History API", "Zero to Mastery", "C++", "C#", "C-sharp", "Java", "Objective-C", "SQL"
 ]
 
+GLOSSARY_MATCHER = compile_glossary(EXCEPTIONS)
+# kérésenkénti glosszárium (szerver mód): szálanként / kontextusonként felülírja a globálisat
+_request_glossary_matcher = contextvars.ContextVar("request_glossary_matcher", default=None)
+GLOSSARY_CACHE_DIR = Path.home() / ".cache" / "srt-hu-translator" / "glossary"
+
 MAX_CHARS_PER_LINE = 65
 MAX_SENTENCES_PER_BLOCK = 5
 MAX_CHARS_PER_BLOCK = 512
+TRANSLATION_BATCH_SIZE = 64  # ennyi mondat megy egyszerre a dekóderbe
+ALIGNMENT_MIN_CONFIDENCE = 0.1  # ez alatt a mondatszám-eltérés újrafordítást von maga után
+CHECKPOINT_EVERY_CHUNKS = 64  # ellenőrzőpont ennyi chunkonként (ha be van kapcsolva)
+SEGMENT_WINDOW_BLOCKS = 256  # ennyi új blokk után szegmentálunk (olvasás közben)
+
+# CTranslate2 futtatási profil (folyamatonként). A profilfájl és a parancssor felülírja.
+CT2_SETTINGS = {
+    "inter_threads": 1,  # párhuzamos kötegek száma
+    "intra_threads": 0,  # szálak kötegenként (0 -> alapértelmezett)
+    "compute_type": "default",  # int8 / int8_float32 / float32 / default
+}
+CT2_PROFILE_PATH = Path.home() / ".config" / "srt-hu-translator" / "ct2_profile.json"
+AUTOTUNE_COMPUTE_TYPES = ["int8", "int8_float32", "float32"]
+AUTOTUNE_SAMPLE = [
+    "Okay.",
+    "Let's get started.",
+    "In this video we are going to talk about frameworks and why they matter.",
+    "React is a library for building user interfaces, and Angular is a full framework.",
+    "First, we install Node.js and create a new project from the terminal.",
+    "Then we push the code to GitHub so the whole team can review it.",
+    "If something goes wrong, don't worry, we will debug it together step by step.",
+    "Docker lets us package the application with all of its dependencies.",
+    "This is a very common pattern that you will see in real projects.",
+    "See you in the next video.",
+] * 10
+
+# Fordítási memória (None -> kikapcsolva)
+TRANSLATION_MEMORY_PATH = Path.home() / ".cache" / "srt-hu-translator" / "translation_memory.sqlite3"
+TRANSLATION_MEMORY_MAX_ENTRIES = 200_000
+SENTENCE_MEMO_MAX_ENTRIES = 100_000  # dekódolt mondatok folyamaton belül (ArgosBackend)
+
+# Argos modell: letöltési cím, ellenőrzött csomag "bélyegzője", offline mód
+ARGOS_MODEL_URL = "https://argos-net.com/v1/translate-en_hu-1_9.argosmodel"
+ARGOS_MODEL_STAMP_PATH = Path.home() / ".cache" / "srt-hu-translator" / "argos_en_hu.stamp.json"
+
+_translation_memory = None
+_translator_backend = None
+_argos_model_ready = False
+_sentence_tokenizer = None
+_argos_packages = {}  # (from, to) -> telepített argos csomag
+_argos_models = {}  # (from, to) -> (ctranslate2.Translator, SentencePieceProcessor)
+
+# Naplózás: alapból csak az összesítések (INFO), -v esetén a régi, chunkonkénti
+# és blokkonkénti diagnosztika (DEBUG). Az üzenetek %-paraméterekkel mennek,
+# így kikapcsolt szinten nem formázódnak.
+log = logging.getLogger(LOGGER_NAME)
+PREVIEW_CHARS = 150
 
 
 # ----------------------------
 # Segédfüggvények
 # ----------------------------
-def ensure_argos_model():
-    installed = argostranslate.package.get_installed_packages()
-    if any(p.from_code == "en" and p.to_code == "hu" for p in installed):
+def _preview(text, limit=PREVIEW_CHARS):
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _package_checksum(package_path):
+    # Olcsó ujjlenyomat: metadata.json tartalma + a modellfájl mérete
+    package_path = Path(package_path)
+    digest = hashlib.sha256((package_path / "metadata.json").read_bytes())
+    model_bin = package_path / "model" / "model.bin"
+    if model_bin.exists():
+        digest.update(str(model_bin.stat().st_size).encode())
+    return digest.hexdigest()
+
+
+def _read_model_stamp(stamp_path):
+    # A bélyegző csak akkor érvényes, ha a csomag még ott van, és nem változott
+    try:
+        stamp = json.loads(Path(stamp_path).read_text(encoding="utf-8"))
+        if _package_checksum(stamp["package_path"]) == stamp["checksum"]:
+            return stamp
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _write_model_stamp(stamp_path, package_path):
+    stamp_path = Path(stamp_path)
+    stamp_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = stamp_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"package_path": str(package_path),
+                               "checksum": _package_checksum(package_path)}), encoding="utf-8")
+    os.replace(tmp, stamp_path)
+
+
+def _find_local_model(local_model):
+    # Helyi .argosmodel fájl, vagy könyvtár, amelyben az en_hu csomag van
+    local_model = Path(local_model)
+    if local_model.is_file():
+        return local_model
+    candidates = sorted(local_model.glob("*.argosmodel"))
+    preferred = [c for c in candidates if "en_hu" in c.name]
+    if not (preferred or candidates):
+        raise FileNotFoundError(f"Nincs .argosmodel fájl itt: {local_model}")
+    return (preferred or candidates)[0]
+
+
+def ensure_argos_model(offline=False, local_model=None, stamp_path=ARGOS_MODEL_STAMP_PATH):
+    """
+    Biztosítja, hogy az en->hu argos modell telepítve legyen. Folyamatonként
+    egyszer fut le; ha érvényes bélyegzőfájl van, a csomagok listázása is
+    elmarad. local_model (.argosmodel fájl vagy könyvtár) esetén onnan
+    telepít, offline módban pedig soha nem fordul a hálózathoz.
+    """
+    global _argos_model_ready
+    if _argos_model_ready:
         return
-    model_url = "https://argos-net.com/v1/translate-en_hu-1_9.argosmodel"
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".argosmodel")
-    tmp_path = tmp.name
-    tmp.close()
-    urllib.request.urlretrieve(model_url, tmp_path)
-    argostranslate.package.install_from_path(tmp_path)
-    os.remove(tmp_path)
 
+    import argostranslate.package
 
-def read_srt(srt_path):
-    raw = Path(srt_path).read_text(encoding="utf-8")
-    raw = raw.replace("\r\n", "\n").replace("\r", "\n")
-    blocks = [b for b in raw.split("\n\n") if b.strip()]
-    srt_blocks = []
-
-    for block in blocks:
-        lines = [line for line in block.split("\n") if line.strip()]
-        if len(lines) < 3:
-            continue
+    stamp = _read_model_stamp(stamp_path) if stamp_path is not None else None
+    if stamp is not None:
+        _argos_packages[("en", "hu")] = argostranslate.package.Package(Path(stamp["package_path"]))
+        _argos_model_ready = True
+        return
+
+    installed = argostranslate.package.get_installed_packages()
+    if not any(p.from_code == "en" and p.to_code == "hu" for p in installed):
+        if local_model is not None:
+            argostranslate.package.install_from_path(_find_local_model(local_model))
+        elif offline:
+            raise RuntimeError("Az en->hu argos modell nincs telepítve, offline módban pedig "
+                               "nem tölthető le (adj meg helyi modellt: --model).")
+        else:
+            import tempfile
+            import urllib.request
+            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".argosmodel")
+            tmp_path = tmp.name
+            tmp.close()
+            urllib.request.urlretrieve(ARGOS_MODEL_URL, tmp_path)
+            argostranslate.package.install_from_path(tmp_path)
+            os.remove(tmp_path)
+
+    pkg = get_argos_package("en", "hu")
+    if stamp_path is not None:
+        _write_model_stamp(stamp_path, pkg.package_path)
+    _argos_model_ready = True
+
+
+class SrtFormatError(ValueError):
+    # Hibás SRT blokk (pl. nem szám az index sor); a szerver 400-zal válaszol rá
+    pass
 
-        # Index tisztítása - csak a BOM karakter eltávolítása az első sorból
-        index_line = lines[0]
-        if index_line.startswith('\ufeff'):
-            index_line = index_line[1:]  # BOM eltávolítása
 
+def _parse_srt_block(lines):
+    lines = [line for line in lines if line.strip()]
+    if len(lines) < 3:
+        return None
+
+    # Index tisztítása - csak a BOM karakter eltávolítása az első sorból
+    index_line = lines[0]
+    if index_line.startswith('\ufeff'):
+        index_line = index_line[1:]  # BOM eltávolítása
+
+    try:
         index = int(index_line.strip())
-        timestamp = lines[1]
-        text = " ".join(lines[2:])
-        srt_blocks.append({"index": index, "timestamp": timestamp, "text": text})
+    except ValueError:
+        raise SrtFormatError(f"hibás SRT index sor: {index_line.strip()!r}") from None
+    timestamp = lines[1]
+    text = " ".join(lines[2:])
+    return {"index": index, "timestamp": timestamp, "text": text}
+
 
-    return srt_blocks
+def iter_srt(srt_path):
+    """
+    Soronként olvassa az SRT fájlt, és blokkonként adja vissza (generátor),
+    így a teljes fájl soha nincs egyszerre a memóriában. A CRLF / CR sorvégeket
+    a szöveges mód univerzális sorvég-kezelése \n-re alakítja.
+    """
+    with open(srt_path, encoding="utf-8", newline=None) as f:
+        yield from iter_srt_lines(f)
+
+
+def iter_srt_lines(source_lines):
+    # Blokkok egy sorokat adó forrásból (fájl, io.StringIO, lista)
+    lines = []
+    for line in source_lines:
+        line = line.rstrip("\n")
+        if line == "":
+            # Üres sor -> blokk vége
+            block = _parse_srt_block(lines)
+            if block is not None:
+                yield block
+            lines = []
+        else:
+            lines.append(line)
+    block = _parse_srt_block(lines)
+    if block is not None:
+        yield block
+
+
+def read_srt(srt_path):
+    return list(iter_srt(srt_path))
+
+
+# ----------------------------
+# Mondatszegmentálás a teljes átiraton
+# ----------------------------
+def ensure_punkt():
+    # NLTK punkt biztosítása (nltk >= 3.9 a punkt_tab adatot használja)
+    import nltk
+    try:
+        nltk.data.find('tokenizers/punkt_tab/english/')
+    except LookupError:
+        nltk.download('punkt_tab', quiet=True)
+
+
+def get_sentence_tokenizer():
+    global _sentence_tokenizer
+    if _sentence_tokenizer is None:
+        ensure_punkt()
+        from nltk.tokenize import PunktTokenizer
+        _sentence_tokenizer = PunktTokenizer("english")
+    return _sentence_tokenizer
+
+
+def sent_tokenize(text):
+    # Ugyanaz, mint nltk.tokenize.sent_tokenize, de a tokenizáló lustán töltődik
+    return get_sentence_tokenizer().tokenize(text)
+
+
+def segment_transcript(eng_blocks, window_blocks=SEGMENT_WINDOW_BLOCKS):
+    """
+    Punkt mondatszegmentálás az átiraton (a blokkok szóközzel összefűzve).
+    Visszatérés: a mondatok listája, és mondatonként azon blokkok listája
+    (blokk index, átfedő karakterek száma), amelyekre a mondat kiterjed.
+    Így a blokkhatáron átnyúló mondat egyben megy fordításra.
+
+    Az eng_blocks lehet generátor is (pl. iter_srt): a blokkokat
+    window_blocks méretű ablakokban szegmentáljuk, tehát a szegmentálás már
+    olvasás közben halad, és a memóriában egyszerre csak egy ablaknyi átirat
+    szöveg van. Az ablak utolsó (még nyitott) mondata a következő ablakkal
+    együtt szegmentálódik újra; a punkt egy mondatvégről a következő
+    tokenből dönt, ezért az eredmény megegyezik az egyben futtatottal.
+    """
+    tokenizer = get_sentence_tokenizer()
+    sentences = []
+    sentence_blocks = []
+    text = ""  # a még le nem zárt átirat-szakasz
+    spans = []  # (blokk index, kezdet, vég) a text-ben
+    new_blocks = 0
+
+    def flush(final):
+        # A text mondatainak kiadása; nem végső ablaknál az utolsó nyitva marad
+        nonlocal text, spans
+        sentence_spans = list(tokenizer.span_tokenize(text))
+        if not final and sentence_spans:
+            keep_from = sentence_spans.pop()[0]
+        else:
+            keep_from = len(text)
+        span_idx = 0
+        for start, end in sentence_spans:
+            sentences.append(text[start:end])
+            # A mondatok sorrendben jönnek, ezért a blokk-mutató csak előre lép
+            while span_idx < len(spans) - 1 and spans[span_idx][2] <= start:
+                span_idx += 1
+            covered = []
+            i = span_idx
+            while i < len(spans) and spans[i][1] < end:
+                overlap = min(end, spans[i][2]) - max(start, spans[i][1])
+                if overlap > 0:
+                    covered.append((spans[i][0], overlap))
+                i += 1
+            sentence_blocks.append(covered)
+        text = text[keep_from:]
+        spans = [(block_idx, max(0, block_start - keep_from), block_end - keep_from)
+                 for block_idx, block_start, block_end in spans if block_end > keep_from]
+
+    for block_idx, block in enumerate(eng_blocks):
+        offset = len(text) + 1 if block_idx else 0
+        text = text + " " + block["text"] if block_idx else block["text"]
+        spans.append((block_idx, offset, offset + len(block["text"])))
+        new_blocks += 1
+        # a nyitva maradt szakasz hosszával arányos ablak: egy nagyon hosszú,
+        # írásjel nélküli szakasz sem szegmentálódik újra négyzetesen sokszor
+        if new_blocks >= max(window_blocks, len(spans) - new_blocks):
+            flush(final=False)
+            new_blocks = 0
+    flush(final=True)
+    return sentences, sentence_blocks
+
+
+def split_by_shares(text, shares):
+    """
+    A szöveget szóhatárokon len(shares) részre vágja, a shares arányában
+    (pl. az angol mondat egyes blokkokra eső karakterszáma szerint).
+    """
+    if len(shares) == 1:
+        return [text]
+    words = text.split()
+    total_share = sum(shares)
+    total_chars = sum(len(w) + 1 for w in words)
+
+    parts = []
+    word_idx = 0
+    consumed = 0
+    cumulative = 0
+    for share in shares[:-1]:
+        cumulative += share
+        target = total_chars * cumulative / total_share
+        part = []
+        while word_idx < len(words) and consumed + (len(words[word_idx]) + 1) / 2 <= target:
+            part.append(words[word_idx])
+            consumed += len(words[word_idx]) + 1
+            word_idx += 1
+        parts.append(" ".join(part))
+    parts.append(" ".join(words[word_idx:]))
+    return parts
+
+
+def distribute_sentences(num_blocks, sentence_blocks, hun_sentences):
+    """
+    A magyar mondatokat az angol mondatok blokk-leképezése alapján osztja
+    vissza a blokkokra. Blokkokon átnyúló mondatot arányosan vágunk szét.
+    Visszatérés: blokkonként a magyar szövegrészek listája.
+    """
+    block_parts = [[] for _ in range(num_blocks)]
+    for covered, hun_sentence in zip(sentence_blocks, hun_sentences):
+        pieces = split_by_shares(hun_sentence, [overlap for _, overlap in covered])
+        for (block_idx, _), piece in zip(covered, pieces):
+            if piece:
+                block_parts[block_idx].append(piece)
+    return block_parts
 
 
 def protect_terms(text):
-    for term in EXCEPTIONS:
-        text = text.replace(term, f"§{term}§")
-    return text
+    # Egyetlen menet az előre lefordított illesztővel; a legtöbb mondatban
+    # nincs védett kifejezés, ezeket a gyors keresés után érintetlenül hagyjuk
+    matcher = active_glossary_matcher()
+    if matcher.search(text) is None:
+        return text
+    return matcher.sub(r"§\g<0>§", text)
+
+
+def active_glossary_matcher():
+    return _request_glossary_matcher.get() or GLOSSARY_MATCHER
+
+
+def use_glossary(terms):
+    # Aktív glosszárium cseréje (pl. könyvtáranként), a lemezen tárolt illesztővel
+    global GLOSSARY_MATCHER
+    GLOSSARY_MATCHER = get_matcher(terms, GLOSSARY_CACHE_DIR)
+
+
+@contextlib.contextmanager
+def glossary_scope(terms):
+    # Glosszárium csak az aktuális szálra / kérésre; párhuzamos kérések nem zavarják egymást.
+    # A kérésenkénti kifejezéslisták nem kerülnek a lemezes cache-be.
+    token = _request_glossary_matcher.set(get_matcher(terms))
+    try:
+        yield
+    finally:
+        _request_glossary_matcher.reset(token)
 
 
 def unprotect_terms(text):
     return text.replace("§", "")
 
 
+def get_argos_package(from_code="en", to_code="hu"):
+    # Folyamatonként egyszer keressük ki, utána a tárolt csomagot adjuk vissza
+    key = (from_code, to_code)
+    if key not in _argos_packages:
+        import argostranslate.package
+        installed = argostranslate.package.get_installed_packages()
+        _argos_packages[key] = next(p for p in installed
+                                    if p.type == "translate" and p.from_code == from_code
+                                    and p.to_code == to_code)
+    return _argos_packages[key]
+
+
+def get_translation_memory():
+    global _translation_memory
+    if _translation_memory is None and TRANSLATION_MEMORY_PATH is not None:
+        _translation_memory = TranslationMemory(TRANSLATION_MEMORY_PATH, TRANSLATION_MEMORY_MAX_ENTRIES)
+    return _translation_memory
+
+
+def load_argos_model(from_code="en", to_code="hu"):
+    """
+    Betölti a telepített argos csomag CTranslate2 modelljét és a
+    sentencepiece tokenizálót, hogy közvetlenül, kötegelve hívhassuk őket.
+    A betöltött modellt folyamatonként egyszer hozzuk létre és újrahasznosítjuk.
+    """
+    key = (from_code, to_code)
+    if key not in _argos_models:
+        import argostranslate.settings
+        import ctranslate2
+        import sentencepiece
+        pkg = get_argos_package(from_code, to_code)
+        translator = ctranslate2.Translator(str(pkg.package_path / "model"),
+                                            device=argostranslate.settings.device,
+                                            **CT2_SETTINGS)
+        tokenizer = sentencepiece.SentencePieceProcessor(
+            model_file=str(pkg.package_path / "sentencepiece.model"))
+        _argos_models[key] = (translator, tokenizer)
+    return _argos_models[key]
+
+
+def translate_protected_batch(protected_chunks, memo=None):
+    """
+    Védett (§...§) szövegrészek listáját fordítja le egyetlen dekóder-kötegben.
+    Minden chunkot mondatokra bontunk, az összes mondat együtt megy a modellbe,
+    majd a kimenetet chunkonként, az eredeti sorrendben rakjuk össze.
+    memo (SentenceMemo) esetén csak a még nem látott, egyedi mondatok mennek
+    a dekóderbe; a felezéses újrapróbák így nem dekódolnak újra semmit.
+    Memó nélkül (pl. autotune időmérés) minden mondat dekódolódik.
+    """
+    if not protected_chunks:
+        return []
+    translator, tokenizer = load_argos_model()
+
+    # Mondatok lapítása, megjegyezve, melyik chunkhoz tartoznak
+    sentences = []
+    owners = []
+    for chunk_idx, chunk in enumerate(protected_chunks):
+        for sentence in sent_tokenize(chunk):
+            sentences.append(sentence)
+            owners.append(chunk_idx)
+
+    if memo is None:
+        hypotheses = _decode_sentences(translator, tokenizer, sentences)
+    else:
+        known = {}
+        for sentence in dict.fromkeys(sentences):
+            tokens = memo.get(sentence)
+            if tokens is not None:
+                known[sentence] = tokens
+        to_decode = [sentence for sentence in dict.fromkeys(sentences) if sentence not in known]
+        decoded = _decode_sentences(translator, tokenizer, to_decode)
+        memo.put_many(zip(to_decode, decoded))
+        known.update(zip(to_decode, decoded))
+        hypotheses = [known[sentence] for sentence in sentences]
+
+    # Tokenek összefűzése chunkonként (ugyanúgy, ahogy az argostranslate teszi)
+    chunk_tokens = [[] for _ in protected_chunks]
+    for chunk_idx, tokens in zip(owners, hypotheses):
+        chunk_tokens[chunk_idx].extend(tokens)
+
+    translated = []
+    for tokens in chunk_tokens:
+        value = "".join(tokens).replace("▁", " ")
+        if value.startswith(" "):
+            value = value[1:]
+        translated.append(value)
+    return translated
+
+
+def _decode_sentences(translator, tokenizer, sentences):
+    # Mondatok -> a legjobb hipotézis tokenjei, egy CTranslate2 hívással
+    if not sentences:
+        return []
+    tokenized = [tokenizer.encode(sentence, out_type=str) for sentence in sentences]
+    results = translator.translate_batch(
+        tokenized,
+        replace_unknowns=True,
+        max_batch_size=TRANSLATION_BATCH_SIZE,
+        beam_size=4,
+        num_hypotheses=1,
+        length_penalty=0.2,
+    )
+    return [result.hypotheses[0] for result in results]
+
+
+class ArgosBackend(TranslatorBackend):
+    # A telepített argos csomag CTranslate2 modellje, kötegelt hívással és
+    # mondatszintű memóval (a már dekódolt mondatokat nem dekódoljuk újra)
+    name = "argos"
+    needs_argos_model = True
+
+    def __init__(self):
+        super().__init__()
+        self.sentence_memo = SentenceMemo(SENTENCE_MEMO_MAX_ENTRIES)
+
+    @property
+    def version(self):
+        return get_argos_package().package_version
+
+    def _translate_batch(self, protected_chunks):
+        hits_before = self.sentence_memo.hits
+        translations = translate_protected_batch(protected_chunks, self.sentence_memo)
+        self.memo_hits += self.sentence_memo.hits - hits_before
+        return translations
+
+
+BACKENDS = {"argos": ArgosBackend, "fake": FakeBackend}
+
+
+def set_translator_backend(backend):
+    # backend: név a BACKENDS-ből, vagy kész TranslatorBackend példány
+    global _translator_backend
+    _translator_backend = BACKENDS[backend]() if isinstance(backend, str) else backend
+    return _translator_backend
+
+
+def get_translator_backend():
+    if _translator_backend is None:
+        set_translator_backend("argos")
+    return _translator_backend
+
+
+def _call_backend(backend, protected_chunks, stats):
+    memo_hits_before = backend.memo_hits
+    with stats.stage("translate"):
+        translations = backend.translate_batch(protected_chunks)
+    stats.count("sentence_memo_hits", backend.memo_hits - memo_hits_before)
+    stats.count("translator_calls")
+    stats.count("translator_chunks", len(protected_chunks))
+    stats.count("chars_sent", sum(len(chunk) for chunk in protected_chunks))
+    return translations
+
+
+def translate_batch(texts, stats=None):
+    """
+    Szövegek listáját fordítja az aktív backenddel. A fordítási memóriában
+    már szereplő védett chunkok nem mennek a modellhez, csak a hiányzók
+    (egy kötegben).
+    """
+    stats = stats if stats is not None else RunStats(timing=False)
+    backend = get_translator_backend()
+    with stats.stage("protect"):
+        protected = [protect_terms(text) for text in texts]
+    memory = get_translation_memory()
+    if memory is None:
+        return [unprotect_terms(t) for t in _call_backend(backend, protected, stats)]
+
+    model_version = backend.version
+    with stats.stage("memory"):
+        known = memory.get_many(protected, "en-hu", model_version)
+    hits = sum(1 for chunk in protected if chunk in known)
+    stats.count("memory_hits", hits)
+    stats.count("memory_misses", len(protected) - hits)
+    missing = [chunk for chunk in dict.fromkeys(protected) if chunk not in known]
+    if missing:
+        new_translations = _call_backend(backend, missing, stats)
+        with stats.stage("memory"):
+            memory.put_many(zip(missing, new_translations), "en-hu", model_version)
+        known.update(zip(missing, new_translations))
+    return [unprotect_terms(known[chunk]) for chunk in protected]
+
+
 def translate_text(text):
-    protected = protect_terms(text)
-    translated = argostranslate.translate.translate(protected, "en", "hu")
-    return unprotect_terms(translated)
+    return translate_batch([text])[0]
+
+
+def plan_chunks(sentences, max_sentences=MAX_SENTENCES_PER_BLOCK, max_chars=MAX_CHARS_PER_BLOCK):
+    """
+    Előre felosztja a mondatlistát fordítási chunkokra: legfeljebb max_sentences
+    mondat és max_chars karakter. A túl hosszú egyedi mondat önálló chunk lesz.
+    Visszatérés: (kezdő index, vég index) párok listája.
+    """
+    chunks = []
+    start = 0
+    while start < len(sentences):
+        end = start + 1
+        chars = len(sentences[start])
+        while (end < len(sentences) and end - start < max_sentences
+               and chars + len(sentences[end]) <= max_chars):
+            chars += len(sentences[end])
+            end += 1
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+def realign_translation(eng_sentences, hun_sentences):
+    """
+    Eltérő mondatszámú chunk fordításának megmentése hossz-alapú illesztéssel.
+    Visszatérés: angol mondatonként egy magyar szöveg, vagy None, ha az
+    illesztés megbízhatósága ALIGNMENT_MIN_CONFIDENCE alatt van.
+    """
+    beads, confidence = align_sentences(eng_sentences, hun_sentences)
+    if confidence < ALIGNMENT_MIN_CONFIDENCE:
+        return None
+    aligned = []
+    for eng_idx, hun_idx in beads:
+        hun_text = " ".join(hun_sentences[j] for j in hun_idx)
+        # 2:1 esetén a magyar mondatot az angol hosszak arányában vágjuk ketté
+        aligned.extend(split_by_shares(hun_text, [len(eng_sentences[i]) for i in eng_idx]))
+    return aligned
+
+
+def _chunk_fingerprint(sentences, start, end):
+    # a védett szöveg ujjlenyomata: a forrás és a glosszárium változását is jelzi
+    return incremental.fingerprint(protect_terms(" ".join(sentences[start:end])))
+
+
+def _translation_config_hash(sentences):
+    return checkpoint.config_hash(
+        sentences, backend=get_translator_backend().version, glossary=active_glossary_matcher().pattern,
+        max_sentences=MAX_SENTENCES_PER_BLOCK, max_chars=MAX_CHARS_PER_BLOCK,
+        min_confidence=ALIGNMENT_MIN_CONFIDENCE)
+
+
+def _translate_chunks(all_eng_sentences, pending, hun_by_start, stats):
+    """
+    A pending chunkok fordítása: először mind egy kötegben; ahol a mondatszám
+    eltér, hossz-alapú illesztéssel próbáljuk megmenteni a fordítást. Ha az
+    illesztés bizonytalan, a chunkot megfelezzük, és csak azokat a feleket
+    bontjuk tovább, amelyek még mindig eltérnek. Minden kör egyetlen köteg.
+    Egy mondatos chunk eredményét mindig elfogadjuk. Az elfogadott chunkok
+    a hun_by_start szótárba kerülnek. Az ArgosBackend mondatonként memóz, így
+    az újrapróbák mondatai már nem mennek a dekóderbe (sentence_memo_hits);
+    a retry_chunks / bisection_rounds nála hívásszámot, nem dekódolást mér.
+    """
+    first_round = True
+    debug = log.isEnabledFor(logging.DEBUG)
+
+    while pending:
+        eng_texts = [" ".join(all_eng_sentences[start:end]) for start, end in pending]
+        translations = translate_batch(eng_texts, stats)
+        if not first_round:
+            stats.count("bisection_rounds")
+            stats.count("retry_chunks", len(pending))
+
+        next_pending = []
+        for (start, end), eng_text, translated in zip(pending, eng_texts, translations):
+            if debug:
+                log.debug("--- Fordítási próba (%d mondat, %d karakter) ---", end - start, len(eng_text))
+                log.debug("Angol: %s", _preview(eng_text))
+
+            with stats.stage("tokenize"):
+                hun_sentences = sent_tokenize(translated)
+            if len(hun_sentences) == end - start:
+                if debug:
+                    log.debug("✓ Sikeres fordítás: %d mondat -> %d mondat", end - start, len(hun_sentences))
+                    log.debug("Magyar: %s", _preview(translated))
+                hun_by_start[start] = (end, None, hun_sentences)
+                continue
+
+            log.debug("✗ Sikertelen: angol=%d, magyar=%d", end - start, len(hun_sentences))
+            if end - start > 1:
+                with stats.stage("align"):
+                    aligned = realign_translation(all_eng_sentences[start:end], hun_sentences)
+                if aligned is not None:
+                    log.debug("✓ Mondathossz-illesztéssel elfogadva")
+                    stats.count("aligned_chunks")
+                    hun_by_start[start] = (end, None, aligned)
+                else:
+                    log.debug("! Bizonytalan illesztés -> felezés")
+                    if first_round:
+                        # ennyi hívásba került volna a régi, mondatonkénti újrafordítás
+                        stats.count("single_fallback_cost", end - start)
+                    mid = (start + end) // 2
+                    next_pending.extend([(start, mid), (mid, end)])
+            else:
+                # egy angol mondat -> pontosan egy magyar bejegyzés (a szétesett vagy
+                # üres fordítás is), különben a visszaosztás a további blokkokat elcsúsztatná
+                log.debug("! Egy mondat eltéréssel, de elfogadjuk")
+                stats.count("forced_single_accepts")
+                hun_by_start[start] = (end, None, [" ".join(hun_sentences)])
+        pending = next_pending
+        first_round = False
+
+
+def translate_sentences(all_eng_sentences, stats=None, state_path=None, checkpoint_path=None):
+    """
+    A teljes mondatlistát fordítja kötegelve (lásd _translate_chunks).
+    Az újrapróbák számlálói a stats objektumba kerülnek.
+
+    state_path esetén inkrementális mód: az előző futás változatlan chunkjait
+    az állapotfájlból vesszük, csak a módosult szakaszok mennek a modellhez,
+    a végén pedig az állapotfájlt frissítjük.
+
+    checkpoint_path esetén a chunkok CHECKPOINT_EVERY_CHUNKS méretű ablakokban
+    fordulnak, és minden ablak után az ellenőrzőpont-fájlhoz hozzáfűzzük az
+    ablak eredményét (következő mondatindex, az új magyar mondatok; a fejlécben
+    a konfiguráció hash). Egy újraindított futás az
+    utolsó ellenőrzőponttól folytatja. A fájlt a hívó törli a sikeres kiírás után.
+    """
+    stats = stats if stats is not None else RunStats(timing=False)
+    hun_by_start = {}  # kezdő index -> (vég index, ujjlenyomat vagy None, magyar mondatok)
+    if state_path is not None:
+        state = incremental.load_state(state_path, get_translator_backend().version)
+        if state is not None:
+            with stats.stage("incremental"):
+                hun_by_start = incremental.match_previous_chunks(
+                    state, all_eng_sentences,
+                    lambda start, end: _chunk_fingerprint(all_eng_sentences, start, end))
+            stats.count("reused_chunks", len(hun_by_start))
+            stats.count("reused_sentences", sum(end - start for start, (end, _, _) in hun_by_start.items()))
+            log.debug("Inkrementális mód: %d chunk újrahasznosítva", len(hun_by_start))
+    pending = [(offset + start, offset + end)
+               for offset, stop in incremental.uncovered_ranges(len(all_eng_sentences), hun_by_start)
+               for start, end in plan_chunks(all_eng_sentences[offset:stop])]
+
+    window = len(pending) or 1
+    if checkpoint_path is not None:
+        window = CHECKPOINT_EVERY_CHUNKS
+        config_digest = _translation_config_hash(all_eng_sentences)
+        resumed = checkpoint.load_checkpoint(checkpoint_path, config_digest)
+        if resumed is not None:
+            next_index, done = resumed
+            hun_by_start.update(done)
+            pending = [chunk for chunk in pending if chunk[0] >= next_index]
+            stats.count("resumed_sentences", next_index)
+            log.info("Folytatás ellenőrzőpontról (%s): %d. mondattól", checkpoint_path, next_index)
+        else:
+            checkpoint.start_checkpoint(checkpoint_path, config_digest)
+
+    for offset in range(0, len(pending), window):
+        window_chunks = pending[offset:offset + window]
+        window_done = {}
+        _translate_chunks(all_eng_sentences, window_chunks, window_done, stats)
+        hun_by_start.update(window_done)
+        if checkpoint_path is not None:
+            # csak az ablak új chunkjai kerülnek a fájlba (hozzáfűzés), így a költség lineáris
+            with stats.stage("checkpoint"):
+                checkpoint.append_checkpoint(checkpoint_path, window_chunks[-1][1], window_done)
+            stats.count("checkpoints")
+
+    accepted = [(start, *hun_by_start[start]) for start in sorted(hun_by_start)]
+    if state_path is not None:
+        with stats.stage("incremental"):
+            incremental.save_state(state_path, get_translator_backend().version, all_eng_sentences, [
+                (start, end, chunk_fp or _chunk_fingerprint(all_eng_sentences, start, end), hun)
+                for start, end, chunk_fp, hun in accepted])
+    return [sentence for _, _, _, hun in accepted for sentence in hun]
 
 
 def format_srt_text(text, max_chars_per_line=MAX_CHARS_PER_LINE):
@@ -92,218 +768,460 @@ def format_srt_text(text, max_chars_per_line=MAX_CHARS_PER_LINE):
     Formázza a szöveget SRT formátumra, szimmetrikusan két sorba tördelve.
     Az első sor legyen picit rövidebb, mint a második.
     """
-    if not text.strip():
-        return ""
+    return break_two_lines(text, max_chars_per_line, shorter_first=True)
 
-    # Először távolítsuk el a felesleges whitespace-eket
-    text = " ".join(text.split())
 
-    # Ha a szöveg rövid, ne tördeld
-    if len(text) <= max_chars_per_line:
-        return text
-
-    # Szavakra bontás
-    words = text.split()
+def format_srt_blocks(texts, max_chars_per_line=MAX_CHARS_PER_LINE):
+    # Egy fájl összes blokkszövegének formázása egy hívásban
+    return [break_two_lines(text, max_chars_per_line, shorter_first=True) for text in texts]
 
-    # Keressük meg az optimális tördelési pontot
-    # Próbáljuk a közepétől kezdeni
-    optimal_break_index = len(words) // 2
-
-    # Először keressünk egy jó pontot a közepétől lefelé
-    for i in range(optimal_break_index, 0, -1):
-        first_line = " ".join(words[:i])
-        if len(first_line) <= max_chars_per_line:
-            # Megnézzük, hogy a második sor sem túl hosszú-e
-            second_line = " ".join(words[i:])
-            if len(second_line) <= max_chars_per_line:
-                # Találtunk jó tördelési pontot
-                return f"{first_line}\n{second_line}"
-
-    # Ha nem sikerült, próbáljuk a közepétől felfelé
-    for i in range(optimal_break_index + 1, len(words)):
-        first_line = " ".join(words[:i])
-        if len(first_line) > max_chars_per_line:
-            # Túl hosszú, menjünk egyet vissza
-            if i > 1:
-                first_line = " ".join(words[:i - 1])
-                second_line = " ".join(words[i - 1:])
-                return f"{first_line}\n{second_line}"
-
-    # Ha minden else fails, osszuk felezve a szavakat
-    mid = len(words) // 2
-    first_line = " ".join(words[:mid])
-    second_line = " ".join(words[mid:])
-
-    return f"{first_line}\n{second_line}"
 
-
-def write_srt(final_srt, out_srt_path):
+def format_srt(final_srt):
     lines = []
     for blk in final_srt:
         lines.append(str(blk["index"]))
         lines.append(blk["timestamp"])
         lines.append(blk["text"])
         lines.append("")
-    Path(out_srt_path).write_text("\n".join(lines), encoding="utf-8")
+    return "\n".join(lines)
 
 
-def process_and_generate_srt(en_srt_path, out_srt_path):
-    ensure_argos_model()
+def write_srt(final_srt, out_srt_path):
+    Path(out_srt_path).write_text(format_srt(final_srt), encoding="utf-8")
 
-    # 1. Beolvassuk az angol SRT-t
-    eng_blocks = read_srt(en_srt_path)
 
-    # 2. Kinyerjük az összes angol mondatot
-    all_eng_sentences = []
-    for block in eng_blocks:
-        sentences = sent_tokenize(block["text"])
-        all_eng_sentences.extend(sentences)
+def process_and_generate_srt(en_srt_path, out_srt_path, stats=None, stats_json=None, state_path=None,
+                             checkpoint_path=None):
+    """
+    Egy angol SRT lefordítása. A szakaszidők és számlálók a stats (RunStats)
+    objektumba kerülnek (ha nincs megadva, újat hozunk létre), stats_json
+    esetén pedig fájlonkénti JSON riportba is. state_path esetén csak az
+    előző futás óta változott chunkokat fordítjuk újra, checkpoint_path esetén
+    pedig egy megszakadt futás az ellenőrzőponttól folytatódik (lásd translate_sentences).
+    """
+    stats = stats if stats is not None else RunStats()
+    if get_translator_backend().needs_argos_model:
+        ensure_argos_model()
 
-    print(f"=== ANGOL SRT FELDOLGOZÁSA ===")
-    print(f"Angol blokkok száma: {len(eng_blocks)}")
-    print(f"Angol mondatok száma: {len(all_eng_sentences)}")
+    # 1-5. Beolvasás (folyamatosan, a szegmentálással együtt: az idő a tokenize
+    # szakaszba számít), fordítás és visszaosztás az időblokkokra
+    eng_blocks = []
+    hun_blocks = translate_blocks(_collect_blocks(iter_srt(en_srt_path), eng_blocks), stats, state_path,
+                                  checkpoint_path, source=en_srt_path)
+    stats.count("files")
 
-    # 3. Fordítjuk blokkonként, figyelve a mondatszámot
-    all_hun_sentences = []
-    current_sentence_idx = 0
+    # 6. Kiírás
+    with stats.stage("write"):
+        write_srt(hun_blocks, out_srt_path)
+    if checkpoint_path is not None:
+        checkpoint.remove_checkpoint(checkpoint_path)
+
+    log.info("%s -> %s: %d blokk, %d -> %d mondat, %d fordítóhívás, %d újrafordított chunk, "
+             "fordítási memória: %d találat / %d hiány",
+             en_srt_path, out_srt_path, len(eng_blocks), stats.get("sentences"), stats.get("hun_sentences"),
+             stats.get("translator_calls"), stats.get("retry_chunks"),
+             stats.get("memory_hits"), stats.get("memory_misses"),
+             extra={"data": {"file": str(en_srt_path), "output": str(out_srt_path), **stats.as_dict()}})
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("=== VÉGEREDMÉNY ===")
+        log.debug("Angol blokkok: %d, magyar blokkok: %d", len(eng_blocks), len(hun_blocks))
+        log.debug("Fordítóhívások: %d köteg, %d chunk, %d karakter", stats.get("translator_calls"),
+                  stats.get("translator_chunks"), stats.get("chars_sent"))
+        log.debug("Újrafordított chunkok (felezés): %d %d körben (mondatonkénti újrafordítással: %d), "
+                  "illesztéssel megmentett chunkok: %d, elfogadott egymondatos eltérések: %d, "
+                  "újradekódolás nélkül (mondatmemó): %d mondat",
+                  stats.get("retry_chunks"), stats.get("bisection_rounds"), stats.get("single_fallback_cost"),
+                  stats.get("aligned_chunks"), stats.get("forced_single_accepts"),
+                  stats.get("sentence_memo_hits"))
+        if get_translation_memory() is not None:
+            log.debug("Fordítási memória: %s", get_translation_memory().summary())
+        if stats.timing:
+            log.debug("Szakaszidők:\n%s", stats.format_timings())
+
+        # Összehasonlítás
+        log.debug("=== ÖSSZEHASONLÍTÁS (utolsó 4 blokk) ===")
+        for i in range(max(0, len(eng_blocks) - 4), len(eng_blocks)):
+            log.debug("Blokk %d (%s):\n  Angol: %s\n  Magyar: %s", i + 1, eng_blocks[i]["timestamp"],
+                      eng_blocks[i]["text"], hun_blocks[i]["text"])
+    if stats_json is not None:
+        stats.write_json(stats_json)
 
-    while current_sentence_idx < len(all_eng_sentences):
-        # Próbáljunk maximum 6 mondatot venni (vagy amennyi van hátra)
-        max_sentences_to_take = min(MAX_SENTENCES_PER_BLOCK, len(all_eng_sentences) - current_sentence_idx)
+    return hun_blocks
 
-        # Kezdjük a maximummal
-        attempt_sentence_count = max_sentences_to_take
 
-        while attempt_sentence_count > 0:
-            # Kivesszük a mondatokat
-            end_idx = current_sentence_idx + attempt_sentence_count
-            block_sentences = all_eng_sentences[current_sentence_idx:end_idx]
+def translate_blocks(eng_blocks, stats=None, state_path=None, checkpoint_path=None, source="<srt>",
+                     max_chars_per_line=MAX_CHARS_PER_LINE):
+    """
+    Angol SRT blokkok -> magyar blokkok (ugyanazokkal az indexekkel és
+    időbélyegekkel). A fájlkezelés nélküli mag: a process_and_generate_srt
+    és a szerver mód is ezt hívja. A source csak a naplóüzenetekbe kerül.
+    Az eng_blocks lehet generátor (iter_srt) is: a szegmentálás olvasás
+    közben halad. A blokkok (index, időbélyeg, szöveg) a visszaosztáshoz a
+    végéig megmaradnak, a teljes átirat szövege viszont nincs egyben.
+    """
+    stats = stats if stats is not None else RunStats(timing=False)
 
-            # Ellenőrizzük a karakterlimit-et
-            block_chars = sum(len(sent) for sent in block_sentences)
+    # 2. Ablakos mondatszegmentálás az átiraton, mondat -> blokk leképezéssel
+    blocks = []
+    with stats.stage("tokenize"):
+        all_eng_sentences, sentence_blocks = segment_transcript(_collect_blocks(eng_blocks, blocks))
+    eng_blocks = blocks
+    stats.count("blocks", len(eng_blocks))
+    stats.count("sentences", len(all_eng_sentences))
+    stats.count("chars", sum(len(s) for s in all_eng_sentences))
 
-            if block_chars > MAX_CHARS_PER_BLOCK:
-                # Túl hosszú, csökkentsük a mondatszámot
-                attempt_sentence_count -= 1
-                continue
+    log.debug("=== ANGOL SRT FELDOLGOZÁSA: %s ===", source)
+    log.debug("Angol blokkok száma: %d", len(eng_blocks))
+    log.debug("Angol mondatok száma: %d", len(all_eng_sentences))
 
-            # Blokk létrehozása
-            eng_block_text = " ".join(block_sentences)
+    # 3. Fordítás: előre felosztott chunkok, kötegelve
+    all_hun_sentences = translate_sentences(all_eng_sentences, stats, state_path, checkpoint_path)
 
-            print(f"\n--- Fordítási próba ({len(block_sentences)} mondat, {block_chars} karakter) ---")
-            print(f"Angol: {eng_block_text[:150]}..." if len(eng_block_text) > 150 else f"Angol: {eng_block_text}")
+    # 4. Most meg kell feleltetnünk a magyar mondatokat az eredeti időblokkoknak
+    log.debug("=== MAGYAR MONDATOK IDŐBLOKKHOZ RENDEZÉSE ===")
+    log.debug("Magyar mondatok száma: %d", len(all_hun_sentences))
+    stats.count("hun_sentences", len(all_hun_sentences))
 
-            # Fordítás
-            translated = translate_text(eng_block_text)
+    # Ellenőrizzük, hogy ugyanannyi magyar mondatunk van-e, mint angol
+    if len(all_hun_sentences) != len(all_eng_sentences):
+        stats.count("final_mismatches")
+        log.warning("Mondatszám eltérés maradt (%s): angol=%d, magyar=%d, különbség=%d mondat",
+                    source, len(all_eng_sentences), len(all_hun_sentences),
+                    len(all_eng_sentences) - len(all_hun_sentences),
+                    extra={"data": {"file": str(source), "eng_sentences": len(all_eng_sentences),
+                                    "hun_sentences": len(all_hun_sentences)}})
+
+    # Most el kell osztanunk a magyar mondatokat az angol időblokkok szerint,
+    # a szegmentáláskor előállított mondat -> blokk leképezés alapján
+    hun_blocks = []
+    with stats.stage("redistribute"):
+        block_parts = distribute_sentences(len(eng_blocks), sentence_blocks, all_hun_sentences)
+        eng_counts = [0] * len(eng_blocks)
+        for covered in sentence_blocks:
+            for block_idx, _ in covered:
+                eng_counts[block_idx] += 1
+
+    # Összefűzzük és egy menetben formázzuk a blokkok szövegét
+    with stats.stage("format"):
+        formatted_texts = format_srt_blocks((" ".join(parts) for parts in block_parts), max_chars_per_line)
+
+    debug = log.isEnabledFor(logging.DEBUG)
+    for eng_block, num_sentences, hun_sentences_for_block, formatted_text in zip(
+            eng_blocks, eng_counts, block_parts, formatted_texts):
+        # Blokk létrehozása
+        hun_blocks.append({
+            "index": eng_block["index"],
+            "timestamp": eng_block["timestamp"],
+            "text": formatted_text
+        })
 
-            # Mondatszám ellenőrzés
-            hun_sentences = sent_tokenize(translated)
+        if debug:
+            log.debug("Blokk %s (%s): angol mondatok: %d, magyar mondatrészek: %d",
+                      eng_block["index"], eng_block["timestamp"], num_sentences, len(hun_sentences_for_block))
+            if formatted_text:
+                log.debug("  Magyar szöveg: %s", formatted_text)
 
-            if len(hun_sentences) == len(block_sentences):
-                # SIKER! Ugyanannyi mondat
-                all_hun_sentences.extend(hun_sentences)
-                current_sentence_idx += len(block_sentences)
+    return hun_blocks
 
-                print(f"✓ Sikeres fordítás: {len(block_sentences)} mondat -> {len(hun_sentences)} mondat")
-                print(f"Magyar: {translated[:150]}..." if len(translated) > 150 else f"Magyar: {translated}")
-                break
-            else:
-                # Nem ugyanannyi mondat
-                print(f"✗ Sikertelen: angol={len(block_sentences)}, magyar={len(hun_sentences)}")
 
-                if attempt_sentence_count > 1:
-                    # Több mondatnál problémák vannak -> azonnal menjünk 1 mondatra
-                    print("! Több mondat problémás -> azonnal 1 mondatra váltás")
-                    attempt_sentence_count = 1
-                else:
-                    # 1 mondatnál is probléma -> elfogadjuk és továbblépünk
-                    print("! Egy mondat eltéréssel, de elfogadjuk")
-                    all_hun_sentences.extend(hun_sentences)
-                    current_sentence_idx += 1
+def _collect_blocks(eng_blocks, collected):
+    # Továbbadja a blokkokat, közben a collected listába is gyűjti őket
+    for block in eng_blocks:
+        collected.append(block)
+        yield block
+
+
+def translate_srt_text(srt_text, stats=None, max_chars_per_line=MAX_CHARS_PER_LINE):
+    # Teljes SRT szöveg -> magyar SRT szöveg, fájlok nélkül (szerver mód)
+    stats = stats if stats is not None else RunStats()
+    with stats.stage("parse"):
+        eng_blocks = list(iter_srt_lines(io.StringIO(srt_text, newline=None)))
+    hun_blocks = translate_blocks(eng_blocks, stats, max_chars_per_line=max_chars_per_line)
+    with stats.stage("write"):
+        hun_srt = format_srt(hun_blocks)
+    return hun_srt
+
+
+# ----------------------------
+# Kötegelt mód: könyvtárak / glob minták
+# ----------------------------
+def collect_srt_files(inputs):
+    """
+    Bemenetek (fájl, könyvtár vagy glob minta) kibontása (forrás, gyökér) párokra.
+    A gyökérhez képesti relatív útvonalat tükrözzük a kimeneti könyvtárban.
+    A már lefordított *.hun.srt fájlokat kihagyjuk.
+    """
+    found = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            found.extend((p, path) for p in sorted(path.rglob("*.srt")))
+        elif glob.has_magic(item):
+            # gyökér: a minta első joker nélküli része (pl. "kurzus/**/*.srt" -> "kurzus")
+            parts = []
+            for part in path.parts:
+                if glob.has_magic(part):
                     break
+                parts.append(part)
+            root = Path(*parts) if parts else Path(".")
+            found.extend((Path(p), root) for p in sorted(glob.glob(item, recursive=True)))
         else:
-            # Ha a while loop végigment és nem talált megfelelő blokkot
-            # (nagyon ritka eset, de le kell kezelni)
-            if current_sentence_idx < len(all_eng_sentences):
-                # Kényszerítjük az egy mondat fordítását
-                single_sentence = all_eng_sentences[current_sentence_idx]
-                print(f"\n--- Kényszer egy mondat ({len(single_sentence)} karakter) ---")
-                print(f"Angol: {single_sentence}")
+            found.append((path, path.parent))
+    return [(p, root) for p, root in found if not p.name.endswith(".hun.srt")]
 
-                translated_single = translate_text(single_sentence)
-                hun_single_sentences = sent_tokenize(translated_single)
 
-                all_hun_sentences.extend(hun_single_sentences)
-                current_sentence_idx += 1
+def hungarian_output_path(src, root, out_dir=None):
+    # "X.eng.srt" / "X.en.srt" / "X.srt" -> "X.hun.srt"
+    stem = src.stem
+    for suffix in (".eng", ".en"):
+        if stem.lower().endswith(suffix):
+            stem = stem[:-len(suffix)]
+            break
+    name = f"{stem}.hun.srt"
+    if out_dir is None:
+        return src.with_name(name)
+    return Path(out_dir) / src.parent.relative_to(root) / name
 
-                print(f"Magyar: {translated_single}")
 
-    # 4. Most meg kell feleltetnünk a magyar mondatokat az eredeti időblokkoknak
-    print(f"\n=== MAGYAR MONDA TOK IDŐBLOKKHOZ RENDEZÉSE ===")
-    print(f"Magyar mondatok száma: {len(all_hun_sentences)}")
+def warm_up():
+    # A modell és a punkt betöltése előre, hogy az első fájl ne fizesse meg
+    if get_translator_backend().needs_argos_model:
+        ensure_argos_model()
+        load_argos_model()
+    sent_tokenize("Warm up.")
 
-    # Ellenőrizzük, hogy ugyanannyi magyar mondatunk van-e, mint angol
-    if len(all_hun_sentences) != len(all_eng_sentences):
-        print(f"!!! VÉGLEGES FIGYELEM: Mondatszám eltérés maradt!")
-        print(f"!!! Angol: {len(all_eng_sentences)}, Magyar: {len(all_hun_sentences)}")
-        print(f"!!! Különbség: {len(all_eng_sentences) - len(all_hun_sentences)} mondat")
 
-    # Most el kell osztanunk a magyar mondatokat az angol időblokkok szerint
-    hun_blocks = []
-    hun_sentence_idx = 0
+def _init_worker(ct2_settings, backend, log_level=logging.INFO, log_json=False):
+    # Munkafolyamat indulása: a modell és a punkt egyszer töltődik be.
+    # A konzolra nem naplózunk, minden fájl saját naplófájlt kap.
+    setup_logging(log_level, log_json, stream=False)
+    CT2_SETTINGS.update(ct2_settings)
+    set_translator_backend(backend)
+    warm_up()
 
-    for eng_block in eng_blocks:
-        # Megnézzük, hány mondat van ebben az angol blokkban
-        eng_sentences_in_block = sent_tokenize(eng_block["text"])
-        num_sentences = len(eng_sentences_in_block)
 
-        # Kiveszünk ugyanannyi magyar mondatot
-        hun_sentences_for_block = []
-        for _ in range(num_sentences):
-            if hun_sentence_idx < len(all_hun_sentences):
-                hun_sentences_for_block.append(all_hun_sentences[hun_sentence_idx])
-                hun_sentence_idx += 1
+def _stats_json_path(dst, stats_json):
+    return dst.with_suffix(".stats.json") if stats_json else None
 
-        # Összefűzzük a mondatokat
-        block_text = " ".join(hun_sentences_for_block)
 
-        # Formázás
-        formatted_text = format_srt_text(block_text)
+def _state_path(dst, incremental_mode):
+    return dst.with_suffix(".state.json") if incremental_mode else None
 
-        # Blokk létrehozása
-        hun_blocks.append({
-            "index": eng_block["index"],
-            "timestamp": eng_block["timestamp"],
-            "text": formatted_text
-        })
 
-        print(f"Blokk {eng_block['index']} ({eng_block['timestamp']}):")
-        print(f"  Angol mondatok: {num_sentences}")
-        print(f"  Magyar mondatok: {len(hun_sentences_for_block)}")
-        if formatted_text:
-            print(f"  Magyar szöveg: {formatted_text}")
+def _checkpoint_path(dst, checkpoints):
+    return dst.with_suffix(".checkpoint.json") if checkpoints else None
 
-    # 6. Kiírás
-    write_srt(hun_blocks, out_srt_path)
-
-    print(f"\n=== VÉGEREDMÉNY ===")
-    print(f"Angol blokkok: {len(eng_blocks)}")
-    print(f"Magyar blokkok: {len(hun_blocks)}")
-    print(f"Angol mondatok: {len(all_eng_sentences)}")
-    print(f"Magyar mondatok: {len(all_hun_sentences)}")
-    print(f"Magyar SRT létrehozva: {out_srt_path}")
-
-    # Összehasonlítás
-    print(f"\n=== ÖSSZEHASONLÍTÁS (utolsó 4 blokk) ===")
-    for i in range(max(0, len(eng_blocks) - 4), len(eng_blocks)):
-        print(f"\nBlokk {i + 1} ({eng_blocks[i]['timestamp']}):")
-        print(f"  Angol: {eng_blocks[i]['text']}")
-        print(f"  Magyar: {hun_blocks[i]['text']}")
 
-    return hun_blocks
+def _translate_file_in_worker(src, dst, glossary_terms, stats_json, incremental_mode=False, checkpoints=True,
+                              log_json=False):
+    # Minden fájl saját naplót kap a kimenet mellett, hogy a párhuzamos
+    # futások kimenete ne keveredjen
+    stats = RunStats()
+    use_glossary(glossary_terms)
+    handler = logging.FileHandler(dst.with_suffix(".log"), mode="w", encoding="utf-8")
+    handler.setFormatter(make_formatter(log_json))
+    log.addHandler(handler)
+    try:
+        process_and_generate_srt(src, dst, stats, _stats_json_path(dst, stats_json),
+                                 _state_path(dst, incremental_mode), _checkpoint_path(dst, checkpoints))
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+    return stats.as_dict()
+
+
+def translate_files(inputs, out_dir=None, workers=1, ct2_settings=None, glossary_files=(),
+                    stats_json=False, incremental_mode=False, checkpoints=True, log_json=False):
+    """
+    Több SRT fordítása egy futásban: a modell és a tokenizáló egyszer töltődik be.
+    workers > 1 esetén a fájlokat több munkafolyamat között osztjuk szét,
+    mindegyik a saját modellpéldányával és ct2_settings szerinti CTranslate2 profillal.
+    A glossary_files kifejezései a beépített EXCEPTIONS listához adódnak, és
+    minden fájlhoz a könyvtárában (vagy felette, a bemenet gyökeréig) talált
+    glossary.txt / glossary.toml is hozzájön.
+    Visszatérés: az összesített RunStats; stats_json esetén minden kimenet
+    mellé *.stats.json riport is kerül. incremental_mode esetén a kimenet
+    melletti *.state.json alapján csak a módosult chunkok fordulnak újra.
+    checkpoints esetén a fordítás közben *.checkpoint.json készül, így egy
+    megszakadt futás újraindítva onnan folytatódik. Párhuzamos futásnál a fájlok naplója
+    a kimenet melletti *.log fájlba megy (log_json esetén JSON sorokként).
+    """
+    CT2_SETTINGS.update(ct2_settings or {})
+    base_terms = merge_glossaries(EXCEPTIONS, *(load_glossary_file(p) for p in glossary_files))
+    files = collect_srt_files(inputs)
+    totals = RunStats()
+    start = time.perf_counter()
+
+    jobs = []
+    directory_terms = {}
+    for src, root in files:
+        dst = hungarian_output_path(src, root, out_dir)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if src.parent not in directory_terms:
+            directory_terms[src.parent] = merge_glossaries(
+                base_terms, *(load_glossary_file(p) for p in find_directory_glossaries(src.parent, root)))
+        jobs.append((src, dst, directory_terms[src.parent]))
+
+    if workers <= 1:
+        for src, dst, glossary_terms in jobs:
+            use_glossary(glossary_terms)
+            file_stats = RunStats()
+            process_and_generate_srt(src, dst, file_stats, _stats_json_path(dst, stats_json),
+                                     _state_path(dst, incremental_mode), _checkpoint_path(dst, checkpoints))
+            totals.merge(file_stats)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(dict(CT2_SETTINGS), get_translator_backend(),
+                                           log.getEffectiveLevel(), log_json)) as pool:
+            futures = {pool.submit(_translate_file_in_worker, src, dst, glossary_terms, stats_json,
+                                   incremental_mode, checkpoints, log_json): dst
+                       for src, dst, glossary_terms in jobs}
+            for future in as_completed(futures):
+                totals.merge(future.result())
+                log.info("✔ %s (%d/%d)", futures[future], totals.get("files"), len(jobs))
+
+    elapsed = time.perf_counter() - start
+    per_sec = (lambda n: n / elapsed) if elapsed > 0 else (lambda n: 0.0)
+    log.info("=== KÖTEGELT FUTÁS ÖSSZESÍTÉSE ===\n"
+             "Fájlok: %d (%.2f fájl/s)\n"
+             "Mondatok: %d (%.1f mondat/s)\n"
+             "Karakterek: %d (%.0f karakter/s)\n"
+             "Fordítóhívások: %d köteg, %d karakter, újrahasznosított chunkok (inkrementális): %d\n"
+             "Fordítási memória: %d találat, %d hiány\n"
+             "Újrafordított chunkok: %d (mondatonkénti újrafordítással: %d, mondatmemóból: %d mondat), "
+             "illesztéssel megmentve: %d, "
+             "végleges mondatszám-eltérés: %d fájlban\n"
+             "Szakaszidők (összesen):\n%s\n"
+             "Idő: %.1f s",
+             totals.get("files"), per_sec(totals.get("files")),
+             totals.get("sentences"), per_sec(totals.get("sentences")),
+             totals.get("chars"), per_sec(totals.get("chars")),
+             totals.get("translator_calls"), totals.get("chars_sent"), totals.get("reused_chunks"),
+             totals.get("memory_hits"), totals.get("memory_misses"),
+             totals.get("retry_chunks"), totals.get("single_fallback_cost"), totals.get("sentence_memo_hits"),
+             totals.get("aligned_chunks"),
+             totals.get("final_mismatches"), totals.format_timings(), elapsed,
+             extra={"data": {"elapsed": elapsed, **totals.as_dict()}})
+    return totals
+
+
+# ----------------------------
+# CTranslate2 profil: betöltés, mentés, automatikus hangolás
+# ----------------------------
+def load_ct2_profile(path=CT2_PROFILE_PATH):
+    path = Path(path)
+    if path.exists():
+        CT2_SETTINGS.update(json.loads(path.read_text(encoding="utf-8")))
+    return dict(CT2_SETTINGS)
+
+
+def save_ct2_profile(settings, path=CT2_PROFILE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(settings, indent=2), encoding="utf-8")
+
+
+def autotune_ct2(path=CT2_PROFILE_PATH):
+    """
+    Lefuttatja az AUTOTUNE_SAMPLE mondatokat minden szál/számítási típus
+    kombinációval, és a leggyorsabb profilt elmenti a profilfájlba.
+    Ha egyik kombináció sem fut le, a meglévő profil érintetlen marad
+    (visszatérés: None).
+    """
+    ensure_argos_model()
+    original_settings = dict(CT2_SETTINGS)
+    cpus = os.cpu_count() or 1
+    intra_options = sorted({n for n in (1, 2, 4, cpus // 2, cpus) if 0 < n <= cpus})
+    protected = [protect_terms(sentence) for sentence in AUTOTUNE_SAMPLE]
+
+    results = []
+    for inter, intra, compute_type in itertools.product((1, 2), intra_options, AUTOTUNE_COMPUTE_TYPES):
+        if inter * intra > cpus:
+            continue
+        settings = {"inter_threads": inter, "intra_threads": intra, "compute_type": compute_type}
+        CT2_SETTINGS.update(settings)
+        _argos_models.clear()
+        try:
+            translate_protected_batch(protected[:2])  # bemelegítés + modell betöltés
+        except ValueError as e:
+            # pl. az adott CPU / CTranslate2 verzió nem támogatja a számítási típust
+            log.warning("- kihagyva %s: %s", settings, e)
+            continue
+        start = time.perf_counter()
+        translate_protected_batch(protected)
+        elapsed = time.perf_counter() - start
+        results.append((elapsed, settings))
+        log.info("- %s: %.2f s (%.1f mondat/s)", settings, elapsed, len(protected) / elapsed)
+
+    _argos_models.clear()
+    if not results:
+        CT2_SETTINGS.clear()
+        CT2_SETTINGS.update(original_settings)
+        log.error("Automatikus hangolás sikertelen: egyik profil sem futott le, a profilfájl (%s) "
+                  "nem változott", path)
+        return None
+    best_elapsed, best = min(results, key=lambda r: r[0])
+    save_ct2_profile(best, path)
+    CT2_SETTINGS.update(best)
+    log.info("Leggyorsabb profil: %s (%.2f s) -> %s", best, best_elapsed, path)
+    return best
 
 
 if __name__ == "__main__":
     INPUT_SRT = ("1. Understanding Frameworks.srt")  # Írd át a fájlnevedre
-    OUTPUT_SRT = "1. Understanding Frameworks.hun.srt"
-    process_and_generate_srt(INPUT_SRT, OUTPUT_SRT)
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="Angol SRT feliratok fordítása magyarra.")
+    parser.add_argument("inputs", nargs="*", default=[INPUT_SRT],
+                        help="SRT fájlok, könyvtárak vagy glob minták (pl. 'kurzus/**/*.srt')")
+    parser.add_argument("-o", "--output-dir",
+                        help="Kimeneti könyvtár (alapból a bemenet mellé kerül a *.hun.srt)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Párhuzamos munkafolyamatok száma (fájlonként osztva)")
+    parser.add_argument("--inter-threads", type=int,
+                        help="CTranslate2 párhuzamos kötegek munkafolyamatonként")
+    parser.add_argument("--intra-threads", "--threads-per-worker", type=int,
+                        help="CTranslate2 szálak kötegenként (0 -> alapértelmezett)")
+    parser.add_argument("--compute-type", choices=AUTOTUNE_COMPUTE_TYPES + ["default"],
+                        help="CTranslate2 számítási típus")
+    parser.add_argument("--profile", default=CT2_PROFILE_PATH,
+                        help="CTranslate2 profilfájl (JSON)")
+    parser.add_argument("-g", "--glossary", action="append", default=[],
+                        help="További glosszárium fájl (.txt vagy .toml), többször is megadható")
+    parser.add_argument("--stats-json", action="store_true",
+                        help="Fájlonkénti *.stats.json riport a szakaszidőkről és számlálókról")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Csak az előző futás óta változott chunkok fordítása (*.state.json alapján)")
+    parser.add_argument("--no-checkpoint", action="store_true",
+                        help="Ne készüljön ellenőrzőpont (*.checkpoint.json) fordítás közben")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="argos",
+                        help="Fordító backend ('fake': determinisztikus álfordító, modell nélkül)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Soha ne töltsön le modellt a hálózatról")
+    parser.add_argument("--model",
+                        help="Helyi .argosmodel fájl vagy könyvtár, ha a modell nincs telepítve")
+    parser.add_argument("--autotune", action="store_true",
+                        help="Profil automatikus hangolása és mentése, fordítás nélkül")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("-v", "--verbose", action="store_true",
+                           help="Részletes diagnosztika (chunkonkénti és blokkonkénti napló)")
+    verbosity.add_argument("-q", "--quiet", action="store_true",
+                           help="Csak figyelmeztetések és hibák")
+    parser.add_argument("--log-json", action="store_true",
+                        help="Napló JSON sorokként (naplógyűjtőkhöz)")
+    args = parser.parse_args()
+    setup_logging(logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO,
+                  args.log_json)
+
+    # A modellt a fő folyamat biztosítja, a munkafolyamatok már a bélyegzőt találják
+    if set_translator_backend(args.backend).needs_argos_model or args.autotune:
+        ensure_argos_model(offline=args.offline, local_model=args.model)
+    if args.autotune:
+        autotune_ct2(args.profile)
+    else:
+        ct2_settings = load_ct2_profile(args.profile)
+        for key in ("inter_threads", "intra_threads", "compute_type"):
+            if getattr(args, key) is not None:
+                ct2_settings[key] = getattr(args, key)
+        translate_files(args.inputs, args.output_dir, args.workers, ct2_settings, args.glossary,
+                        args.stats_json, args.incremental, not args.no_checkpoint, args.log_json)
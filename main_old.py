@@ -1,25 +1,20 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import bisect
 import os
 import re
 import tempfile
 import urllib.request
 from pathlib import Path
 
-import argostranslate.package
-import argostranslate.translate
-import nltk
-from nltk.data import find
-from nltk.tokenize import sent_tokenize
+import main
+from glossary import compile_glossary
+from line_breaking import break_two_lines
 
-# ----------------------------
-# NLTK punkt biztosítása
-# ----------------------------
-try:
-    find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+# Az argostranslate és az nltk (punkt) csak első használatkor töltődik be
+# (ensure_argos_model, main.sent_tokenize), így a modul modell és hálózat
+# nélkül is importálható, és a backend előtte lecserélhető.
 
 # ----------------------------
 # Konfiguráció
@@ -29,7 +24,19 @@ EXCEPTIONS = [
     "Git", "GitHub", "TypeScript", "JavaScript", "AWS", "Azure"
 ]
 
+GLOSSARY_MATCHER = compile_glossary(EXCEPTIONS)
+# kifejezés a környező whitespace-szel együtt (fix_protected_terms_and_markers)
+GLOSSARY_SPACING = re.compile(r"\s*(" + GLOSSARY_MATCHER.pattern + r")\s*")
+
+# A fordítás ezen a backenden megy át (pl. backends.FakeBackend() benchmarkhoz / CI-hoz).
+# None -> első használatkor a main.py kötegelt CTranslate2 útja (main.ArgosBackend):
+# egy translate_batch hívás = egy dekóder-köteg.
+TRANSLATOR_BACKEND = None
+
 MARKER_FMT = "[[{num:05d}]]"
+MARKER_PATTERN = r'(\[\[\d{5}\]\])'
+FRAGMENT_BATCH_SIZE = 64  # ennyi egyedi tagmondat-töredék megy egy backend hívásba
+CLAUSE_SEARCH_WINDOW = 200  # a szókurzor után legfeljebb ennyi szón belül keressük a tagmondatot
 MAX_CHARS_PER_LINE = 60  # ha egy sor <= ennél, egy sorban marad
 MAX_LINES_PER_BLOCK = 2
 
@@ -40,16 +47,23 @@ CONJUNCTIONS = ["and","or","but","so","therefore","because","who","what","how",
 # Segédfüggvények
 # ----------------------------
 def protect_terms(text):
-    for term in EXCEPTIONS:
-        # szóközök biztosítása, hogy a fordító ne ragassza a környező szöveghez
-        text = text.replace(term, f" §{term}§ ")
-    return text
+    if GLOSSARY_MATCHER.search(text) is None:
+        return text
+    # szóközök biztosítása, hogy a fordító ne ragassza a környező szöveghez
+    return GLOSSARY_MATCHER.sub(r" §\g<0>§ ", text)
 
 def unprotect_terms(text):
     text = text.replace("§", "")
     return re.sub(r'\s+', ' ', text).strip()
 
+def get_translator_backend():
+    global TRANSLATOR_BACKEND
+    if TRANSLATOR_BACKEND is None:
+        TRANSLATOR_BACKEND = main.ArgosBackend()
+    return TRANSLATOR_BACKEND
+
 def ensure_argos_model():
+    import argostranslate.package
     installed = argostranslate.package.get_installed_packages()
     if any(p.from_code == "en" and p.to_code == "hu" for p in installed):
         return
@@ -61,112 +75,54 @@ def ensure_argos_model():
     argostranslate.package.install_from_path(tmp_path)
     os.remove(tmp_path)
 
+def translate_marked_sentences(sentences, batch_size=FRAGMENT_BATCH_SIZE):
+    # A markerek közötti töredékeket a fájl összes mondatából összegyűjtjük,
+    # a (védett) ismétlődéseket kiszűrjük, és kötegekben fordítjuk; utána
+    # mondatonként visszarakjuk őket a markerek közé
+    split_sentences = []
+    translations = {}  # védett töredék -> fordítás
+    num_fragments = 0
+    for sentence in sentences:
+        parts = []
+        for part in re.split(MARKER_PATTERN, sentence):
+            if re.fullmatch(MARKER_PATTERN, part) or part.strip() == "":
+                parts.append((part, None))
+            else:
+                chunk = protect_terms(part)
+                translations.setdefault(chunk, None)
+                parts.append((part, chunk))
+                num_fragments += 1
+        split_sentences.append(parts)
+
+    backend = get_translator_backend()
+    unique = list(translations)
+    for i in range(0, len(unique), batch_size):
+        batch = unique[i:i+batch_size]
+        for chunk, translated_chunk in zip(batch, backend.translate_batch(batch)):
+            translations[chunk] = unprotect_terms(translated_chunk)
+    print(f"[Fordítás] {num_fragments} töredék, {len(unique)} egyedi, "
+          f"{(len(unique) + batch_size - 1) // batch_size} backend hívás")
+
+    return ["".join(part if chunk is None else translations[chunk] for part, chunk in parts)
+            for parts in split_sentences]
+
 def translate_with_preserved_markers(full_text):
-    pattern = r'(\[\[\d{5}\]\])'
-    parts = re.split(pattern, full_text)
-    out_parts = []
-    for part in parts:
-        if re.fullmatch(pattern, part):
-            out_parts.append(part)
-        elif part.strip() == "":
-            out_parts.append(part)
-        else:
-            chunk = protect_terms(part)
-            translated_chunk = argostranslate.translate.translate(chunk, "en", "hu")
-            translated_chunk = unprotect_terms(translated_chunk)
-            out_parts.append(translated_chunk)
-    return "".join(out_parts)
+    return translate_marked_sentences([full_text])[0]
 
 def fix_protected_terms_and_markers(translated_text):
-    # EXCEPTIONS szavak rendezése (ha szükséges)
-    for term in EXCEPTIONS:
-        translated_text = re.sub(rf'\s*{re.escape(term)}\s*', f' {term} ', translated_text)
+    # EXCEPTIONS szavak rendezése (ha szükséges) - egy menetben, leghosszabb egyezéssel
+    translated_text = GLOSSARY_SPACING.sub(r' \1 ', translated_text)
     translated_text = translated_text.replace('#', '')
     translated_text = re.sub(r'\s+', ' ', translated_text).strip()
     return translated_text
 
-# ------------------------------------------------
-#  ÚJ FUNKCIÓ – sorhosszok kiegyensúlyozása flip-flop nélkül
-# ------------------------------------------------
-def balance_two_lines(line1, line2):
-    """
-    Ha a két sor hossza >10 karakterrel eltér, akkor a hosszabbból átpakolunk
-    egy szót a rövidebbhez. Maximum 3 iteráció, hogy ne legyen végtelen ciklus.
-    """
-    for _ in range(3):
-        len1, len2 = len(line1), len(line2)
-        diff = abs(len1 - len2)
-        if diff <= 10:
-            break
-
-        # Felső hosszabb → levágjuk a végét és áttesszük a másik elejére
-        if len1 > len2:
-            parts = line1.split()
-            if len(parts) <= 1:
-                break
-            moved = parts.pop()  # utolsó szó
-            line1 = " ".join(parts)
-            line2 = moved + " " + line2
-
-        # Alsó hosszabb → levágjuk az elejéről és hozzácsapjuk a felső végére
-        else:
-            parts = line2.split()
-            if len(parts) <= 1:
-                break
-            moved = parts.pop(0)  # első szó
-            line2 = " ".join(parts)
-            line1 = line1 + " " + moved
-
-    return line1.strip(), line2.strip()
-
 # ----------------------------
-# wrap_text_to_lines módosítva: hívja a balance_two_lines()-t
+# wrap_text_to_lines: a közös, lineáris idejű kétsoros tördelőt hívja
 # - ha a teljes szöveg <= max_chars => 1 sor
-# - különben max 2 sor, és ha nagyon egyenetlen, kicsit átrendezünk
+# - különben max 2 sor, a legkiegyensúlyozottabb szóhatáron
 # ----------------------------
 def wrap_text_to_lines(text, max_chars=MAX_CHARS_PER_LINE, max_lines=MAX_LINES_PER_BLOCK):
-    words = text.split()
-
-    # --- ha a teljes szöveg rövidebb mint limit, tartsuk egy sorban ---
-    if len(text) <= max_chars:
-        return text
-
-    lines = []
-    cur_line = []
-    cur_len = 0
-
-    for i, word in enumerate(words):
-        extra_space = 1 if cur_line else 0
-        if cur_len + len(word) + extra_space <= max_chars:
-            cur_line.append(word)
-            cur_len += len(word) + extra_space
-        else:
-            lines.append(" ".join(cur_line))
-            cur_line = [word]
-            cur_len = len(word)
-            if len(lines) >= max_lines:
-                # maradékot az utolsó sorhoz fűzzük
-                rest = " ".join(cur_line + words[i+1:])
-                lines[-1] = lines[-1] + " " + rest
-                break
-
-    if cur_line:
-        lines.append(" ".join(cur_line))
-
-    # ha egy sor maradt, adjunk vissza egy sort
-    if len(lines) == 1:
-        return lines[0]
-
-    # ha több mint 2 sor jött létre, csak az első kettőt használjuk
-    if len(lines) > 2:
-        lines = lines[:2]
-
-    # kiegyensúlyozás
-    line1, line2 = balance_two_lines(lines[0], lines[1])
-    # ha a végeredmény rövidebb mindkét sor összege kisebb mint max_chars, lehet egy sorba tenni
-    if len(line1) + 1 + len(line2) <= max_chars:
-        return (line1 + " " + line2).strip()
-    return line1 + "\n" + line2
+    return break_two_lines(text, max_chars, shorter_first=False)
 
 # ----------------------------
 # Tagmondat-split heurisztika
@@ -205,6 +161,16 @@ def read_srt_full_text(srt_path):
 # ----------------------------
 # Markerelés + timestamp hozzárendelés (szólista-alapú)
 # ----------------------------
+def find_clause(full_words, clause_words, cursor, window=CLAUSE_SEARCH_WINDOW):
+    # A tagmondat első előfordulása a kurzortól (korlátos ablakban); -1, ha nincs.
+    # A kurzor csak előre halad, így az ismétlődő fordulatok a saját helyükre kerülnek.
+    n = len(clause_words)
+    last = min(len(full_words) - n, cursor + window)
+    for i in range(cursor, last + 1):
+        if full_words[i] == clause_words[0] and full_words[i:i+n] == clause_words:
+            return i
+    return -1
+
 def mark_text_and_assign_timestamps(full_text, srt_blocks):
     marker_id = 1
     marker_to_timestamp = {}
@@ -220,34 +186,31 @@ def mark_text_and_assign_timestamps(full_text, srt_blocks):
         words = content.split()
         block_word_indices.append((word_idx, word_idx+len(words)-1, lines[1].strip()))
         word_idx += len(words)
+    # blokk kezdő szóindexek a bináris kereséshez (üres blokknál a következővel egyezik,
+    # a bisect_right ilyenkor a nem üres, későbbi blokkot adja)
+    block_starts = [start_idx for start_idx, _, _ in block_word_indices]
 
-    sentences = sent_tokenize(full_text)
+    cursor = 0  # monoton szókurzor: a következő tagmondat innen kezdődhet
+    sentences = main.sent_tokenize(full_text)
     for sent in sentences:
         clauses = split_into_clauses(sent)
         for clause in clauses:
             marker = MARKER_FMT.format(num=marker_id)
             clause_words = clause.strip().split()
-            found_idx = -1
-            for i in range(len(full_words)-len(clause_words)+1):
-                if full_words[i:i+len(clause_words)] == clause_words:
-                    found_idx = i
-                    break
-            if found_idx == -1:
-                ts_assigned = "00:00:00,000 --> 00:00:04,000"
-            else:
-                ts_assigned = "00:00:00,000 --> 00:00:04,000"
-                for start_idx, end_idx, ts in block_word_indices:
-                    if found_idx >= start_idx and found_idx <= end_idx:
-                        ts_assigned = ts
-                        # csúsztatási logika itt (ha szükséges a speciális esetekhez)
-                        # *** Ha a clause utolsó szava kötőszó és az a blokk végén van,
-                        #     akkor csúsztassuk a következő blokk timestamp-jére (ha létezik).
-                        if clause_words[-1].lower() in CONJUNCTIONS:
-                            idx_block = block_word_indices.index((start_idx, end_idx, ts))
-                            if found_idx == end_idx and idx_block + 1 < len(block_word_indices):
-                                ts_assigned = block_word_indices[idx_block+1][2]
-                                print(f"[Marker csúsztatva] {marker} -> {ts_assigned}")
-                        break
+            found_idx = find_clause(full_words, clause_words, cursor)
+            ts_assigned = "00:00:00,000 --> 00:00:04,000"
+            if found_idx != -1:
+                cursor = found_idx + len(clause_words)
+                idx_block = bisect.bisect_right(block_starts, found_idx) - 1
+                if idx_block >= 0 and found_idx <= block_word_indices[idx_block][1]:
+                    end_idx, ts_assigned = block_word_indices[idx_block][1:]
+                    # csúsztatási logika itt (ha szükséges a speciális esetekhez)
+                    # *** Ha a clause utolsó szava kötőszó és az a blokk végén van,
+                    #     akkor csúsztassuk a következő blokk timestamp-jére (ha létezik).
+                    if clause_words[-1].lower() in CONJUNCTIONS:
+                        if found_idx == end_idx and idx_block + 1 < len(block_word_indices):
+                            ts_assigned = block_word_indices[idx_block+1][2]
+                            print(f"[Marker csúsztatva] {marker} -> {ts_assigned}")
             marker_to_timestamp[marker] = ts_assigned
             marked_clauses.append((marker, clause.strip(), ts_assigned))
             print(f"[Marker] {marker} '{clause.strip()}' -> {ts_assigned}")
@@ -316,15 +279,15 @@ def generate_srt_from_translated(translated_sentences, marker_to_timestamp, outp
 # Fő folyamat
 # ----------------------------
 def process_and_generate_srt(en_srt_path, out_srt_path):
-    ensure_argos_model()
+    if get_translator_backend().needs_argos_model:
+        ensure_argos_model()
     full_text, srt_blocks = read_srt_full_text(en_srt_path)
     marked_clauses, marker_to_timestamp = mark_text_and_assign_timestamps(full_text, srt_blocks)
     sentences_for_translation = build_sentences_for_translation(marked_clauses)
 
     translated_sentences = []
     print("\n--- Fordítás megkezdése ---\n")
-    for sent in sentences_for_translation:
-        translated = translate_with_preserved_markers(sent)
+    for sent, translated in zip(sentences_for_translation, translate_marked_sentences(sentences_for_translation)):
         translated = fix_protected_terms_and_markers(translated)
         print(f"\n[Fordítás]\n{sent}\n→ {translated}")
         translated_sentences.append(translated)
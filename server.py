@@ -0,0 +1,225 @@
+"""
+Hosszan futó, helyi fordítószerver: a modell, a tokenizáló és a punkt egyszer
+töltődik be, utána minden kérés csak a fordítás idejét fizeti.
+
+Végpontok:
+    POST /translate   törzs: angol SRT (text/plain vagy application/x-subrip),
+                      válasz: magyar SRT. Opciók query stringben:
+                      ?max_chars_per_line=42&glossary=Vite,Next.js
+                      JSON törzs esetén ({"srt": "...", "glossary": [...],
+                      "max_chars_per_line": 42}) a válasz is JSON:
+                      {"srt": "...", "stats": {...}}
+    GET  /health      állapot és kérésszámláló (JSON)
+    GET  /metrics     a kérések közötti kötegelés mérőszámai (JSON)
+
+A párhuzamos kérések chunkjait egy ütemező (backends.BatchingBackend)
+legfeljebb --max-wait-ms ideig gyűjti, és --max-batch-chunks méretű
+közös kötegben adja a modellnek.
+
+Használat:
+    python server.py --port 8765                 # HTTP a 127.0.0.1-en
+    python server.py --max-batch-chunks 128 --max-wait-ms 10
+    python server.py --socket /tmp/srt-hu.sock   # Unix socket
+    curl --data-binary @kurzus.srt http://127.0.0.1:8765/translate > kurzus.hun.srt
+"""
+import argparse
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import main
+from backends import BatchingBackend
+from glossary import load_glossary_file, merge_glossaries
+from instrumentation import RunStats
+from structured_logging import setup_logging
+
+log = main.log
+MAX_REQUEST_BYTES = 32 * 2 ** 20
+
+
+class TranslationService:
+    """
+    A betöltött pipeline kérésenkénti hívása. A kérések párhuzamosan futnak:
+    a glosszárium kérésenkénti (main.glossary_scope), a modellhívásokat pedig
+    a közös BatchingBackend ütemezi.
+    """
+
+    def __init__(self, glossary_terms, batching_backend):
+        self.glossary_terms = glossary_terms
+        self.batching_backend = batching_backend
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.started = time.time()
+
+    def translate(self, srt_text, extra_terms=(), max_chars_per_line=main.MAX_CHARS_PER_LINE):
+        stats = RunStats()
+        with main.glossary_scope(merge_glossaries(self.glossary_terms, extra_terms)):
+            hun_srt = main.translate_srt_text(srt_text, stats, max_chars_per_line)
+        with self.lock:
+            self.requests += 1
+        log.info("Kérés: %d blokk, %d mondat, %d fordítóhívás, fordítási memória: %d találat / %d hiány",
+                 stats.get("blocks"), stats.get("sentences"), stats.get("translator_calls"),
+                 stats.get("memory_hits"), stats.get("memory_misses"), extra={"data": stats.as_dict()})
+        return hun_srt, stats
+
+    def health(self):
+        return {"status": "ok", "backend": main.get_translator_backend().version,
+                "requests": self.requests, "uptime": round(time.time() - self.started, 1)}
+
+    def metrics(self):
+        return {"requests": self.requests, "batching": self.batching_backend.metrics()}
+
+
+class TranslationRequestHandler(BaseHTTPRequestHandler):
+    service = None  # a szerver indításakor állítjuk be
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(HTTPStatus.OK, self.service.health())
+        elif path == "/metrics":
+            self._send_json(HTTPStatus.OK, self.service.metrics())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "ismeretlen végpont"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/translate":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "ismeretlen végpont"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "hibás Content-Length"})
+            return
+        if length < 0:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "hibás Content-Length"})
+            return
+        if length > MAX_REQUEST_BYTES:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "túl nagy kérés"})
+            return
+        try:
+            body = self.rfile.read(length).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "a kérés törzse nem UTF-8"})
+            return
+
+        as_json = self.headers.get_content_type() == "application/json"
+        try:
+            if as_json:
+                options = json.loads(body)
+                srt_text = options["srt"]
+                extra_terms = options.get("glossary", [])
+                if not isinstance(srt_text, str):
+                    raise ValueError("az srt mező szöveg kell legyen")
+                if not isinstance(extra_terms, list) or not all(isinstance(t, str) for t in extra_terms):
+                    raise ValueError("a glossary szövegek listája kell legyen")
+            else:
+                options = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                srt_text = body
+                extra_terms = [t.strip() for t in options.get("glossary", "").split(",") if t.strip()]
+            max_chars = int(options.get("max_chars_per_line", main.MAX_CHARS_PER_LINE))
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"hibás kérés: {e}"})
+            return
+
+        try:
+            hun_srt, stats = self.service.translate(srt_text, extra_terms, max_chars)
+        except main.SrtFormatError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"hibás SRT: {e}"})
+            return
+        except Exception as e:
+            log.exception("Fordítási hiba")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            return
+        if as_json:
+            self._send_json(HTTPStatus.OK, {"srt": hun_srt, "stats": stats.as_dict()})
+        else:
+            self._send(HTTPStatus.OK, hun_srt.encode("utf-8"), "application/x-subrip; charset=utf-8")
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def _send(self, status, payload, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def address_string(self):
+        # Unix socket esetén nincs (host, port) cím
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        log.debug("%s - " + format, self.address_string(), *args)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ""
+
+
+def make_server(service, host="127.0.0.1", port=8765, socket_path=None):
+    handler = type("Handler", (TranslationRequestHandler,), {"service": service})
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return ThreadingUnixHTTPServer(socket_path, handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main_server():
+    parser = argparse.ArgumentParser(description="Angol->magyar SRT fordítószerver (meleg modellel).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="Unix socket útvonala (HTTP port helyett)")
+    parser.add_argument("--backend", choices=sorted(main.BACKENDS), default="argos")
+    parser.add_argument("--profile", default=main.CT2_PROFILE_PATH, help="CTranslate2 profilfájl (JSON)")
+    parser.add_argument("-g", "--glossary", action="append", default=[],
+                        help="További glosszárium fájl (.txt vagy .toml), többször is megadható")
+    parser.add_argument("--offline", action="store_true", help="Soha ne töltsön le modellt a hálózatról")
+    parser.add_argument("--model", help="Helyi .argosmodel fájl vagy könyvtár")
+    parser.add_argument("--max-batch-chunks", type=int, default=64,
+                        help="Ennyi chunk gyűlik össze legfeljebb egy közös modellhívásba")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="Legfeljebb ennyit vár az ütemező további kérésekre (ms)")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument("--log-json", action="store_true")
+    args = parser.parse_args()
+    setup_logging(logging.DEBUG if args.verbose else logging.INFO, args.log_json)
+
+    main.load_ct2_profile(args.profile)
+    if main.set_translator_backend(args.backend).needs_argos_model:
+        main.ensure_argos_model(offline=args.offline, local_model=args.model)
+    main.warm_up()
+    main.get_translation_memory()  # a kapcsolat induláskor jön létre, nem az első kérésben
+    batching_backend = main.set_translator_backend(BatchingBackend(
+        main.get_translator_backend(), args.max_batch_chunks, args.max_wait_ms / 1000))
+
+    glossary_terms = merge_glossaries(main.EXCEPTIONS, *(load_glossary_file(p) for p in args.glossary))
+    server = make_server(TranslationService(glossary_terms, batching_backend), args.host, args.port, args.socket)
+    log.info("Fordítószerver fut: %s", args.socket or f"http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main_server()
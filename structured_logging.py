@@ -0,0 +1,51 @@
+import json
+import logging
+import sys
+
+# ----------------------------
+# Szintezett, strukturált naplózás
+# ----------------------------
+LOGGER_NAME = "srt_translator"
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Egy rekord = egy JSON sor. Az `extra={"data": {...}}` mezői a "data"
+    kulcs alá kerülnek, így a naplógyűjtő szűrhet rájuk.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        data = getattr(record, "data", None)
+        if data:
+            entry["data"] = data
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def make_formatter(json_lines=False):
+    return JsonLinesFormatter() if json_lines else logging.Formatter("%(message)s")
+
+
+def setup_logging(level=logging.INFO, json_lines=False, stream=None):
+    """
+    A projekt loggerének beállítása: egyetlen kezelő a megadott streamre
+    (alapból stderr). stream=False esetén nincs konzolkezelő; a
+    munkafolyamatok így csak a fájlonkénti naplófájlba írnak.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    if stream is not False:
+        handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+        handler.setFormatter(make_formatter(json_lines))
+        logger.addHandler(handler)
+    return logger
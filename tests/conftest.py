@@ -0,0 +1,21 @@
+import pytest
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+import main
+from backends import FakeBackend
+
+
+@pytest.fixture(autouse=True)
+def offline_pipeline(monkeypatch):
+    # Modell, punkt letöltés és lemezen tárolt fordítási memória nélkül:
+    # tanítatlan punkt tokenizáló és determinisztikus álfordító
+    monkeypatch.setattr(main, "_sentence_tokenizer", PunktSentenceTokenizer())
+    monkeypatch.setattr(main, "TRANSLATION_MEMORY_PATH", None)
+    monkeypatch.setattr(main, "_translation_memory", None)
+    monkeypatch.setattr(main, "_translator_backend", FakeBackend())
+
+
+@pytest.fixture
+def sentences():
+    return [f"Sentence number {i} talks about React Native and GitHub." if i % 7 == 0
+            else f"This is sentence {i} of the lecture." for i in range(300)]
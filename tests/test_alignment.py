@@ -0,0 +1,39 @@
+import main
+from alignment import align_sentences
+
+
+def test_one_to_one():
+    eng = ["Hello there.", "I went home."]
+    hun = ["Szia.", "Hazamentem."]
+    beads, confidence = align_sentences(eng, hun)
+    assert beads == [([0], [0]), ([1], [1])]
+    assert 0 < confidence <= 1
+
+
+def test_two_english_merged_into_one():
+    eng = ["Hello there.", "I went home.", "It was very late."]
+    hun = ["Helló.", "Hazamentem, mert nagyon késő volt."]
+    beads, _ = align_sentences(eng, hun)
+    assert beads == [([0], [0]), ([1, 2], [1])]
+
+
+def test_one_english_split_into_two():
+    eng = ["Hello there.", "I went home because it was very late."]
+    hun = ["Helló.", "Hazamentem.", "Nagyon késő volt."]
+    beads, _ = align_sentences(eng, hun)
+    assert beads == [([0], [0]), ([1], [1, 2])]
+
+
+def test_impossible_alignment():
+    assert align_sentences(["One.", "Two.", "Three.", "Four."], ["Egy."]) == ([], 0.0)
+
+
+def test_realign_translation_merges_extra_sentences():
+    eng = ["Hello there.", "I went home because it was very late."]
+    hun = ["Helló.", "Hazamentem.", "Nagyon késő volt."]
+    assert main.realign_translation(eng, hun) == ["Helló.", "Hazamentem. Nagyon késő volt."]
+
+
+def test_realign_translation_rejects_low_confidence(monkeypatch):
+    monkeypatch.setattr(main, "ALIGNMENT_MIN_CONFIDENCE", 1.1)
+    assert main.realign_translation(["Hello there.", "Bye."], ["Szia.", "Most.", "Viszlát."]) is None
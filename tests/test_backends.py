@@ -0,0 +1,20 @@
+import main
+from backends import FakeBackend
+
+
+def test_fake_backend_is_deterministic():
+    chunks = ["Hello there. How are you?", "This is §React Native§ code."]
+    first, second = FakeBackend().translate_batch(chunks), FakeBackend().translate_batch(chunks)
+    assert first == second
+    assert "§React Native§" in first[1]
+
+
+def test_fake_backend_counts_calls():
+    backend = FakeBackend()
+    backend.translate_batch(["One.", "Two."])
+    assert (backend.calls, backend.chunks, backend.chars) == (1, 2, 8)
+
+
+def test_backend_selected_by_name():
+    assert isinstance(main.set_translator_backend("fake"), FakeBackend)
+    assert main.get_translator_backend().version == FakeBackend().version
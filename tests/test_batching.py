@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from backends import BatchingBackend, TranslatorBackend
+
+
+class RecordingBackend(TranslatorBackend):
+    name = "recording"
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def _translate_batch(self, protected_chunks):
+        self.batch_sizes.append(len(protected_chunks))
+        return [chunk.upper() for chunk in protected_chunks]
+
+
+def test_batching_respects_cap():
+    inner = RecordingBackend()
+    backend = BatchingBackend(inner, max_batch_chunks=10, max_wait=0.2)
+    sizes = [6, 9, 3, 9]
+    results = {}
+
+    def submit(n):
+        chunks = [f"request {n} chunk {i}" for i in range(sizes[n])]
+        results[n] = (chunks, backend.translate_batch(chunks))
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(len(sizes))]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert max(inner.batch_sizes) <= 10
+    assert sum(inner.batch_sizes) == sum(sizes)
+    for chunks, translated in results.values():
+        assert translated == [chunk.upper() for chunk in chunks]
+    metrics = backend.metrics()
+    assert metrics["submissions"] == len(sizes)
+    assert metrics["avg_batch_fill"] <= 1.0
+
+
+def test_oversized_submission_goes_alone():
+    inner = RecordingBackend()
+    backend = BatchingBackend(inner, max_batch_chunks=4, max_wait=0.01)
+    assert backend.translate_batch([str(i) for i in range(9)]) == [str(i) for i in range(9)]
+    assert inner.batch_sizes == [9]
+    assert backend.metrics()["avg_batch_fill"] == 9 / 4
+
+
+def test_errors_reach_every_waiting_request():
+    class Failing(TranslatorBackend):
+        def _translate_batch(self, protected_chunks):
+            raise RuntimeError("modell hiba")
+
+    backend = BatchingBackend(Failing(), max_batch_chunks=8, max_wait=0.01)
+    with pytest.raises(RuntimeError, match="modell hiba"):
+        backend.translate_batch(["a", "b"])
+    assert backend.translate_batch([]) == []
@@ -0,0 +1,77 @@
+import pytest
+
+import checkpoint
+import main
+from backends import FakeBackend
+from instrumentation import RunStats
+
+
+class CrashingBackend(FakeBackend):
+    # Az n-edik hívás után "összeomlik"
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+
+    def _translate_batch(self, protected_chunks):
+        if self.calls > self.fail_after:
+            raise RuntimeError("szimulált összeomlás")
+        return super()._translate_batch(protected_chunks)
+
+
+def test_checkpoint_crash_and_resume(tmp_path, monkeypatch, sentences):
+    monkeypatch.setattr(main, "CHECKPOINT_EVERY_CHUNKS", 2)
+    full = RunStats(timing=False)
+    expected = main.translate_sentences(sentences, full)
+    checkpoint_path = tmp_path / "run.checkpoint"
+
+    main.set_translator_backend(CrashingBackend(fail_after=3))
+    with pytest.raises(RuntimeError):
+        main.translate_sentences(sentences, RunStats(timing=False), checkpoint_path=checkpoint_path)
+    assert checkpoint_path.exists()
+
+    # csonka utolsó sor (írás közbeni összeomlás): betöltéskor levágjuk
+    with open(checkpoint_path, "a", encoding="utf-8") as f:
+        f.write('{"next_index": 99999, "chu')
+
+    main.set_translator_backend(FakeBackend())
+    stats = RunStats(timing=False)
+    assert main.translate_sentences(sentences, stats, checkpoint_path=checkpoint_path) == expected
+    assert 0 < stats.get("resumed_sentences") < len(sentences)
+    assert stats.get("translator_chunks") < full.get("translator_chunks")
+
+
+def test_checkpoint_ignored_when_config_changes(tmp_path, sentences):
+    checkpoint_path = tmp_path / "run.checkpoint"
+    checkpoint.start_checkpoint(checkpoint_path, "regi-hash")
+    checkpoint.append_checkpoint(checkpoint_path, 5, {0: (5, None, ["x"] * 5)})
+    stats = RunStats(timing=False)
+    main.translate_sentences(sentences, stats, checkpoint_path=checkpoint_path)
+    assert stats.get("resumed_sentences") == 0
+
+
+def test_append_only_records_round_trip(tmp_path):
+    path = tmp_path / "run.checkpoint"
+    checkpoint.start_checkpoint(path, "h")
+    checkpoint.append_checkpoint(path, 2, {0: (2, "fp0", ["A.", "B."])})
+    checkpoint.append_checkpoint(path, 3, {2: (3, None, ["C."])})
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3  # fejléc + ablakonként egy sor
+    assert checkpoint.load_checkpoint(path, "h") == (3, {0: (2, "fp0", ["A.", "B."]), 2: (3, None, ["C."])})
+
+
+def test_record_without_newline_is_truncated(tmp_path):
+    path = tmp_path / "run.checkpoint"
+    checkpoint.start_checkpoint(path, "h")
+    checkpoint.append_checkpoint(path, 2, {0: (2, None, ["A.", "B."])})
+    size = path.stat().st_size
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"next_index": 3, "chunks": [[2, 3, null, ["C."]]]}')  # teljes JSON, de \n nélkül
+    assert checkpoint.load_checkpoint(path, "h")[0] == 2
+    assert path.stat().st_size == size
+
+
+def test_config_hash_depends_on_sentences_and_settings():
+    base = checkpoint.config_hash(["a", "b"], backend="fake")
+    assert base == checkpoint.config_hash(["a", "b"], backend="fake")
+    assert base != checkpoint.config_hash(["a", "c"], backend="fake")
+    assert base != checkpoint.config_hash(["ab"], backend="fake")
+    assert base != checkpoint.config_hash(["a", "b"], backend="argos")
@@ -0,0 +1,26 @@
+import json
+
+import main
+
+
+def test_autotune_keeps_profile_when_every_setting_fails(tmp_path, monkeypatch):
+    profile = tmp_path / "ct2_profile.json"
+    profile.write_text(json.dumps({"inter_threads": 1, "intra_threads": 2, "compute_type": "int8"}))
+    monkeypatch.setattr(main, "CT2_SETTINGS", main.load_ct2_profile(profile))
+    monkeypatch.setattr(main, "ensure_argos_model", lambda *a, **k: None)
+
+    def unsupported(protected_chunks, memo=None):
+        raise ValueError("unsupported compute type")
+
+    monkeypatch.setattr(main, "translate_protected_batch", unsupported)
+    before = profile.read_text()
+    assert main.autotune_ct2(profile) is None
+    assert profile.read_text() == before
+    assert main.CT2_SETTINGS == json.loads(before)
+
+
+def test_profile_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "CT2_SETTINGS", dict(main.CT2_SETTINGS))
+    settings = {"inter_threads": 2, "intra_threads": 4, "compute_type": "int8_float32"}
+    main.save_ct2_profile(settings, tmp_path / "sub" / "profile.json")
+    assert main.load_ct2_profile(tmp_path / "sub" / "profile.json") == {**main.CT2_SETTINGS, **settings}
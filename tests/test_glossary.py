@@ -0,0 +1,27 @@
+import main
+from glossary import compile_glossary
+
+TERMS = ["React", "React Native", "Git", "GitHub", "C", "C++", "C#"]
+
+
+def test_longest_match_wins():
+    matcher = compile_glossary(TERMS)
+    text = "React Native apps on GitHub, written in C++ or C# with Git and React."
+    assert matcher.findall(text) == ["React Native", "GitHub", "C++", "C#", "Git", "React"]
+
+
+def test_term_order_does_not_matter():
+    text = "React Native on GitHub in C++"
+    assert compile_glossary(TERMS).findall(text) == compile_glossary(reversed(TERMS)).findall(text)
+
+
+def test_empty_glossary_never_matches():
+    assert compile_glossary([]).search("React") is None
+    assert compile_glossary([""]).search("React") is None
+
+
+def test_protect_terms_marks_each_term_once():
+    text = "We use React Native, GitHub and C++ here."
+    assert main.protect_terms(text) == "We use §React Native§, §GitHub§ and §C++§ here."
+    assert main.protect_terms("Nothing to protect.") == "Nothing to protect."
+    assert main.unprotect_terms(main.protect_terms(text)) == text
@@ -0,0 +1,50 @@
+import glossary
+from glossary import find_directory_glossaries, get_matcher, load_glossary_file, merge_glossaries
+
+
+def test_load_txt_glossary(tmp_path):
+    path = tmp_path / "glossary.txt"
+    path.write_text("# megjegyzés\nVite\n\n  Next.js  \n", encoding="utf-8")
+    assert load_glossary_file(path) == ["Vite", "Next.js"]
+
+
+def test_load_toml_glossary(tmp_path):
+    path = tmp_path / "glossary.toml"
+    path.write_text('terms = ["Vite", "Next.js"]\n', encoding="utf-8")
+    assert load_glossary_file(path) == ["Vite", "Next.js"]
+
+
+def test_merge_keeps_order_without_duplicates():
+    assert merge_glossaries(["React", "Vite"], ["Vite", "Svelte"]) == ["React", "Vite", "Svelte"]
+
+
+def test_find_directory_glossaries_outermost_first(tmp_path):
+    inner = tmp_path / "course" / "section1"
+    inner.mkdir(parents=True)
+    (tmp_path / "glossary.txt").write_text("Root\n", encoding="utf-8")
+    (tmp_path / "course" / "glossary.toml").write_text('terms = ["Course"]\n', encoding="utf-8")
+    (inner / "glossary.txt").write_text("Inner\n", encoding="utf-8")
+    found = find_directory_glossaries(inner, tmp_path)
+    assert [p.relative_to(tmp_path).as_posix() for p in found] == [
+        "glossary.txt", "course/glossary.toml", "course/section1/glossary.txt"]
+    # a gyökér fölötti fájlok nem számítanak
+    assert find_directory_glossaries(inner, tmp_path / "course")[0].parent.name == "course"
+
+
+def test_get_matcher_is_cached_in_process():
+    assert get_matcher(["Vite", "Next.js"]) is get_matcher(["Next.js", "Vite", "Vite"])
+
+
+def test_get_matcher_disk_cache(tmp_path, monkeypatch):
+    matcher = get_matcher(["Disk", "Cached"], tmp_path)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    monkeypatch.setattr(glossary, "_matchers", type(glossary._matchers)())
+    monkeypatch.setattr(glossary, "compile_glossary", lambda terms: None)  # a lemezről kell jönnie
+    assert get_matcher(["Cached", "Disk"], tmp_path).pattern == matcher.pattern
+
+
+def test_in_process_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(glossary, "_matchers", type(glossary._matchers)())
+    for i in range(glossary.MATCHER_CACHE_SIZE + 10):
+        get_matcher([f"Term{i}"])
+    assert len(glossary._matchers) == glossary.MATCHER_CACHE_SIZE
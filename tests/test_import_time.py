@@ -0,0 +1,20 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("argostranslate", "ctranslate2", "sentencepiece", "stanza", "nltk")
+
+
+@pytest.mark.parametrize("module", ["main", "server", "main_old"])
+def test_import_does_not_load_heavy_dependencies(module):
+    # friss interpreter kell: a conftest már betölti az nltk-t
+    code = (f"import json, sys; import {module}; "
+            f"print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}})))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True,
+                            check=True)
+    loaded = set(json.loads(result.stdout))
+    assert loaded.isdisjoint(HEAVY_MODULES), sorted(loaded.intersection(HEAVY_MODULES))
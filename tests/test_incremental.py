@@ -0,0 +1,59 @@
+import incremental
+import main
+from instrumentation import RunStats
+
+
+def _state(sentences, chunks):
+    return {"sentences": [incremental.fingerprint(s) for s in sentences],
+            "chunks": [{"start": a, "end": b, "fingerprint": f"{a}", "hun": [f"h{a}"]} for a, b in chunks]}
+
+
+def test_incremental_reuses_all_but_edited_chunk(tmp_path, sentences):
+    state_path = tmp_path / "run.state.json"
+    main.translate_sentences(sentences, state_path=state_path)
+
+    edited = list(sentences)
+    edited[150] = "This sentence was edited after the first run."
+    expected = main.translate_sentences(edited)
+
+    stats = RunStats(timing=False)
+    assert main.translate_sentences(edited, stats, state_path=state_path) == expected
+    # csak a módosított mondatot tartalmazó chunk megy újra a modellhez
+    assert stats.get("translator_calls") >= 1
+    assert len(edited) - stats.get("reused_sentences") <= main.MAX_SENTENCES_PER_BLOCK
+    assert stats.get("translator_chunks") - stats.get("retry_chunks") == 1
+
+
+def test_inserted_sentence_shifts_chunks():
+    old = ["a", "b", "c", "d", "e", "f"]
+    new = ["a", "b", "NEW", "c", "d", "e", "f"]
+    state = _state(old, [(0, 2), (2, 4), (4, 6)])
+    reused = incremental.match_previous_chunks(state, new, lambda start, end: f"{start - (start > 2)}")
+    assert reused == {0: (2, "0", ["h0"]), 3: (5, "2", ["h2"]), 5: (7, "4", ["h4"])}
+
+
+def test_edits_at_both_ends_with_repetitive_middle():
+    # hosszabb a DIFF_AUTOJUNK_MIN-nél: a köztes szakasz autojunk-kal illesztődik
+    old = ["Okay."] * 2000 + [f"Line {i}." for i in range(1000)]
+    new = ["Changed."] + old[1:-1] + ["Changed too."]
+    state = _state(old, [(i, i + 10) for i in range(0, 3000, 10)])
+    reused = incremental.match_previous_chunks(state, new, lambda start, end: f"{start}")
+    assert sorted(reused) == list(range(10, 2990, 10))
+
+
+def test_fingerprint_change_forces_retranslation():
+    old = ["a", "b", "c", "d"]
+    reused = incremental.match_previous_chunks(_state(old, [(0, 2), (2, 4)]), old,
+                                               lambda start, end: "glossary changed" if start == 2 else f"{start}")
+    assert list(reused) == [0]
+
+
+def test_uncovered_ranges():
+    assert incremental.uncovered_ranges(10, {2: (4,), 4: (6,), 8: (9,)}) == [(0, 2), (6, 8), (9, 10)]
+    assert incremental.uncovered_ranges(3, {}) == [(0, 3)]
+
+
+def test_other_model_version_ignores_state(tmp_path):
+    incremental.save_state(tmp_path / "s.json", "v1", ["a"], [(0, 1, "fp", ["A"])])
+    assert incremental.load_state(tmp_path / "s.json", "v1")["chunks"][0]["hun"] == ["A"]
+    assert incremental.load_state(tmp_path / "s.json", "v2") is None
@@ -0,0 +1,37 @@
+import main
+from line_breaking import break_two_lines
+
+
+def test_fits_on_one_line():
+    assert break_two_lines("  short   text ", 42) == "short text"
+
+
+def test_single_long_word_stays():
+    assert break_two_lines("a" * 60, 42) == "a" * 60
+
+
+def test_tie_prefers_shorter_first_line():
+    # mindkét töréspontnál 2 és 5 karakter a két sor
+    assert break_two_lines("ab cd ef", 5) == "ab\ncd ef"
+    assert break_two_lines("ab cd ef", 5, shorter_first=False) == "ab cd\nef"
+
+
+def test_balanced_break():
+    assert break_two_lines("aa bb cc dd", 5) == "aa bb\ncc dd"
+
+
+def test_overflow_minimizes_longer_line():
+    # nincs szabályos töréspont: a hosszabbik sor legyen a lehető legrövidebb
+    assert break_two_lines("abcdefgh ijklmnop qr", 5) == "abcdefgh\nijklmnop qr"
+
+
+def test_empty_text():
+    assert break_two_lines("   ", 42) == ""
+
+
+def test_format_srt_text_uses_repo_limit():
+    text = "word " * 20
+    lines = main.format_srt_text(text).split("\n")
+    assert len(lines) == 2
+    assert all(len(line) <= main.MAX_CHARS_PER_LINE for line in lines)
+    assert len(lines[0]) <= len(lines[1])
@@ -0,0 +1,81 @@
+import pytest
+
+import main_old
+from backends import FakeBackend
+
+SRT = ("1\n00:00:01,000 --> 00:00:03,000\nWe open React and we build the page,\n\n"
+       "2\n00:00:03,000 --> 00:00:05,000\nthen we push it to GitHub.\n\n"
+       "3\n00:00:05,000 --> 00:00:07,000\nSee you in the next video.\n")
+
+
+@pytest.fixture
+def fake_backend(monkeypatch, capsys):
+    backend = FakeBackend(merge_rate=0.0, split_rate=0.0)
+    monkeypatch.setattr(main_old, "TRANSLATOR_BACKEND", backend)
+    return backend
+
+
+def test_runs_end_to_end_with_fake_backend(tmp_path, fake_backend):
+    src, out = tmp_path / "a.eng.srt", tmp_path / "a.hun.srt"
+    src.write_text(SRT, encoding="utf-8")
+    main_old.process_and_generate_srt(src, out)
+    blocks = out.read_text(encoding="utf-8").strip().split("\n\n")
+    assert [b.split("\n")[1] for b in blocks] == ["00:00:01,000 --> 00:00:03,000",
+                                                   "00:00:03,000 --> 00:00:05,000",
+                                                   "00:00:05,000 --> 00:00:07,000"]
+    assert "GitHub" in blocks[1]
+    assert fake_backend.calls >= 1
+
+
+def test_default_backend_is_resolved_lazily(monkeypatch):
+    monkeypatch.setattr(main_old, "TRANSLATOR_BACKEND", None)
+    assert main_old.get_translator_backend().needs_argos_model
+
+
+def test_repeated_phrase_maps_to_its_own_block(capsys):
+    blocks = ["1\n00:00:01,000 --> 00:00:02,000\nLet's do it again.",
+              "2\n00:00:02,000 --> 00:00:03,000\nNow watch closely.",
+              "3\n00:00:03,000 --> 00:00:04,000\nLet's do it again."]
+    full_text = " ".join(b.split("\n", 2)[2] for b in blocks)
+    marked, _ = main_old.mark_text_and_assign_timestamps(full_text, blocks)
+    assert [(clause, ts[:12]) for _, clause, ts in marked] == [
+        ("Let's do it again.", "00:00:01,000"),
+        ("Now watch closely.", "00:00:02,000"),
+        ("Let's do it again.", "00:00:03,000"),
+    ]
+
+
+def test_find_clause_searches_forward_from_cursor():
+    words = "a b c a b c".split()
+    assert main_old.find_clause(words, ["a", "b"], 0) == 0
+    assert main_old.find_clause(words, ["a", "b"], 1) == 3
+    assert main_old.find_clause(words, ["x"], 0) == -1
+    assert main_old.find_clause(words, ["a", "b"], 1, window=1) == -1
+
+
+class CountingBackend(FakeBackend):
+    def __init__(self):
+        super().__init__(merge_rate=0.0, split_rate=0.0)
+        self.batches = []
+
+    def _translate_batch(self, protected_chunks):
+        self.batches.append(list(protected_chunks))
+        return super()._translate_batch(protected_chunks)
+
+
+def test_marked_fragments_are_deduplicated_and_batched(monkeypatch, capsys):
+    backend = CountingBackend()
+    monkeypatch.setattr(main_old, "TRANSLATOR_BACKEND", backend)
+    sentences = [f"[[{2 * i + 1:05d}]] Okay, [[{2 * i + 2:05d}]] we use React {i % 25}." for i in range(100)]
+    translated = main_old.translate_marked_sentences(sentences, batch_size=10)
+
+    sent = [chunk for batch in backend.batches for chunk in batch]
+    assert len(sent) == len(set(sent)) == 26  # "Okay," egyszer + 25 különböző második töredék
+    assert len(backend.batches) == 3
+    assert all(len(batch) <= 10 for batch in backend.batches)
+    assert any("§React§" in chunk for chunk in sent)
+    for i, hun in enumerate(translated):
+        assert hun.startswith(f"[[{2 * i + 1:05d}]]")
+        assert f"[[{2 * i + 2:05d}]]" in hun
+        assert "React" in hun and "§" not in hun
+    assert translated[0] == translated[25].replace("00051", "00001").replace("00052", "00002")
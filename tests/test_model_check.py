@@ -0,0 +1,91 @@
+import json
+import sys
+import types
+import urllib.request
+
+import pytest
+
+import main
+
+
+class FakePackage:
+    type = "translate"
+    from_code = "en"
+    to_code = "hu"
+    package_version = "1.9"
+
+    def __init__(self, package_path):
+        self.package_path = package_path
+
+
+@pytest.fixture
+def argos(tmp_path, monkeypatch):
+    # Hamis argostranslate.package: számolja a csomaglistázásokat és a telepítéseket
+    package_dir = tmp_path / "en_hu"
+    (package_dir / "model").mkdir(parents=True)
+    (package_dir / "metadata.json").write_text('{"from_code": "en", "to_code": "hu"}', encoding="utf-8")
+    package_module = types.ModuleType("argostranslate.package")
+    package_module.installed = []
+    package_module.scans = 0
+    package_module.installs = []
+
+    def get_installed_packages():
+        package_module.scans += 1
+        return list(package_module.installed)
+
+    def install_from_path(path):
+        package_module.installs.append(path)
+        package_module.installed.append(FakePackage(package_dir))
+
+    package_module.get_installed_packages = get_installed_packages
+    package_module.install_from_path = install_from_path
+    package_module.Package = FakePackage
+    root = types.ModuleType("argostranslate")
+    root.package = package_module
+    monkeypatch.setitem(sys.modules, "argostranslate", root)
+    monkeypatch.setitem(sys.modules, "argostranslate.package", package_module)
+    monkeypatch.setattr(main, "_argos_model_ready", False)
+    monkeypatch.setattr(main, "_argos_packages", {})
+    monkeypatch.setattr(urllib.request, "urlretrieve", lambda *a, **k: pytest.fail("hálózati letöltés"))
+    package_module.package_dir = package_dir
+    return package_module
+
+
+def test_valid_stamp_skips_package_scan(tmp_path, argos):
+    stamp = tmp_path / "stamp.json"
+    main._write_model_stamp(stamp, argos.package_dir)
+    main.ensure_argos_model(stamp_path=stamp)
+    assert argos.scans == 0
+    assert main.get_argos_package().package_path == argos.package_dir
+
+
+def test_stale_stamp_rescans_and_rewrites(tmp_path, argos):
+    stamp = tmp_path / "stamp.json"
+    stamp.write_text(json.dumps({"package_path": str(argos.package_dir), "checksum": "régi"}), encoding="utf-8")
+    argos.installed.append(FakePackage(argos.package_dir))
+    main.ensure_argos_model(stamp_path=stamp)
+    assert argos.scans >= 1
+    assert main._read_model_stamp(stamp) is not None
+
+
+def test_second_call_is_free(tmp_path, argos):
+    argos.installed.append(FakePackage(argos.package_dir))
+    main.ensure_argos_model(stamp_path=None)
+    scans = argos.scans
+    main.ensure_argos_model(stamp_path=None)
+    assert argos.scans == scans
+
+
+def test_offline_without_model_raises(argos):
+    with pytest.raises(RuntimeError):
+        main.ensure_argos_model(offline=True, stamp_path=None)
+    assert argos.installs == []
+
+
+def test_local_model_directory_is_installed(tmp_path, argos):
+    models = tmp_path / "models"
+    models.mkdir()
+    (models / "other.argosmodel").write_bytes(b"")
+    (models / "translate-en_hu-1_9.argosmodel").write_bytes(b"")
+    main.ensure_argos_model(offline=True, local_model=models, stamp_path=None)
+    assert [p.name for p in argos.installs] == ["translate-en_hu-1_9.argosmodel"]
@@ -0,0 +1,28 @@
+import main
+from backends import FakeBackend
+from instrumentation import RunStats
+
+
+def test_translate_sentences_with_fake_backend(sentences):
+    stats = RunStats(timing=False)
+    hun = main.translate_sentences(sentences, stats)
+    assert hun
+    assert stats.get("translator_calls") >= 1
+    assert main.translate_sentences(sentences) == hun
+
+
+def test_split_single_sentence_keeps_block_alignment(monkeypatch):
+    # minden mondat kettéesik: a felezés egymondatos chunkokig megy, és ott
+    # is pontosan egy magyar bejegyzés jut minden angol mondatra
+    monkeypatch.setattr(main, "_translator_backend", FakeBackend(merge_rate=0.0, split_rate=1.0))
+    monkeypatch.setattr(main, "ALIGNMENT_MIN_CONFIDENCE", 1.1)  # az illesztés soha nem ment meg
+    blocks = [{"index": 1, "timestamp": "t1", "text": "We start with the first long sentence here, and then"},
+              {"index": 2, "timestamp": "t2", "text": "we continue. Another sentence follows it, with a comma."},
+              {"index": 3, "timestamp": "t3", "text": "See you."}]
+    stats = RunStats(timing=False)
+    hun_blocks = main.translate_blocks(blocks, stats)
+    assert stats.get("forced_single_accepts") > 0
+    assert stats.get("final_mismatches") == 0
+    assert stats.get("hun_sentences") == stats.get("sentences")
+    assert all(block["text"] for block in hun_blocks)
+    assert hun_blocks[2]["text"] == FakeBackend(merge_rate=0.0, split_rate=0.0).translate_batch(["See you."])[0]
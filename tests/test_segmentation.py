@@ -0,0 +1,33 @@
+import main
+
+
+def _blocks(*texts):
+    return [{"index": i + 1, "timestamp": "", "text": text} for i, text in enumerate(texts)]
+
+
+def test_sentence_crossing_blocks_is_one_sentence():
+    sentences, sentence_blocks = main.segment_transcript(_blocks("Hello there. This sentence", "goes on. Bye."))
+    assert sentences == ["Hello there.", "This sentence goes on.", "Bye."]
+    assert sentence_blocks == [[(0, 12)], [(0, 13), (1, 8)], [(1, 4)]]
+
+
+def test_crossing_sentence_is_split_back_by_share():
+    sentence_blocks = [[(0, 12)], [(0, 13), (1, 8)], [(1, 4)]]
+    hun = ["Szia.", "Ez a hosszú mondat tovább folytatódik.", "Viszlát."]
+    parts = main.distribute_sentences(2, sentence_blocks, hun)
+    assert parts == [["Szia.", "Ez a hosszú mondat tovább"], ["folytatódik.", "Viszlát."]]
+
+
+def test_split_by_shares_keeps_all_words():
+    text = "egy kettő három négy öt hat hét"
+    parts = main.split_by_shares(text, [1, 1, 1])
+    assert len(parts) == 3
+    assert " ".join(p for p in parts if p).split() == text.split()
+
+
+def test_translate_blocks_keeps_block_timing():
+    blocks = [{"index": 7, "timestamp": "00:00:01,000 --> 00:00:02,000", "text": "Hello there. This"},
+              {"index": 8, "timestamp": "00:00:02,000 --> 00:00:03,000", "text": "is the end."}]
+    hun = main.translate_blocks(blocks)
+    assert [(b["index"], b["timestamp"]) for b in hun] == [(b["index"], b["timestamp"]) for b in blocks]
+    assert all(b["text"] for b in hun)
@@ -0,0 +1,119 @@
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+import main
+import server
+from backends import BatchingBackend
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nWe build it with Vite.\n\n2\n00:00:02,000 --> 00:00:03,000\nSee you.\n"
+
+
+@pytest.fixture
+def base_url(monkeypatch):
+    # mint a main_server: a kérések a közös kötegelőn át érik el a (hamis) modellt
+    batching = BatchingBackend(main.get_translator_backend(), max_batch_chunks=16, max_wait=0.001)
+    monkeypatch.setattr(main, "_translator_backend", batching)
+    service = server.TranslationService(list(main.EXCEPTIONS), batching)
+    httpd = server.make_server(service, "127.0.0.1", 0)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _request(address, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection(*address, timeout=10)
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    payload = response.read()
+    conn.close()
+    return response.status, payload
+
+
+def _raw(address, request_bytes):
+    # kézzel összerakott kérés (hibás fejlécekhez, amelyeket a http.client nem küld el)
+    with socket.create_connection(address, timeout=10) as sock:
+        sock.sendall(request_bytes)
+        data = b""
+        while chunk := sock.recv(4096):
+            data += chunk
+    return int(data.split(b" ", 2)[1])
+
+
+def test_plain_srt_request(base_url):
+    status, payload = _request(base_url, "POST", "/translate?glossary=Vite&max_chars_per_line=30",
+                               SRT.encode("utf-8"), {"Content-Type": "application/x-subrip"})
+    assert status == 200
+    blocks = [b for b in main.iter_srt_lines(payload.decode("utf-8").splitlines(keepends=True))]
+    assert [b["index"] for b in blocks] == [1, 2]
+    assert "Vite" in blocks[0]["text"]
+
+
+def test_json_request(base_url):
+    body = json.dumps({"srt": SRT, "glossary": ["Vite"], "max_chars_per_line": 30}).encode("utf-8")
+    status, payload = _request(base_url, "POST", "/translate", body, {"Content-Type": "application/json"})
+    assert status == 200
+    data = json.loads(payload)
+    assert data["stats"]["counters"]["blocks"] == 2
+    assert data["srt"].startswith("1\n")
+
+
+@pytest.mark.parametrize("body", [
+    {"srt": SRT, "glossary": "Vite"},
+    {"srt": SRT, "glossary": ["Vite", 3]},
+    {"srt": 5},
+    {"glossary": ["Vite"]},
+    {"srt": SRT, "max_chars_per_line": "sok"},
+])
+def test_bad_json_fields(base_url, body):
+    status, _ = _request(base_url, "POST", "/translate", json.dumps(body).encode("utf-8"),
+                         {"Content-Type": "application/json"})
+    assert status == 400
+
+
+def test_malformed_json(base_url):
+    status, _ = _request(base_url, "POST", "/translate", b"{not json", {"Content-Type": "application/json"})
+    assert status == 400
+
+
+def test_malformed_srt(base_url):
+    bad = "abc\n00:00:01,000 --> 00:00:02,000\nHello.\n"
+    status, payload = _request(base_url, "POST", "/translate", bad.encode("utf-8"))
+    assert status == 400
+    assert "SRT" in json.loads(payload)["error"]
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_bad_content_length(base_url, length):
+    assert _raw(base_url, b"POST /translate HTTP/1.1\r\nHost: x\r\nContent-Length: " + length + b"\r\n\r\n") == 400
+
+
+def test_non_utf8_body(base_url):
+    assert _raw(base_url, b"POST /translate HTTP/1.1\r\nHost: x\r\nContent-Length: 2\r\n\r\n\xff\xfe") == 400
+
+
+def test_too_large(base_url):
+    length = str(server.MAX_REQUEST_BYTES + 1).encode()
+    assert _raw(base_url, b"POST /translate HTTP/1.1\r\nHost: x\r\nContent-Length: " + length + b"\r\n\r\n") == 413
+
+
+def test_unknown_path_and_status_endpoints(base_url):
+    assert _request(base_url, "POST", "/nope", b"")[0] == 404
+    assert _request(base_url, "GET", "/nope")[0] == 404
+    status, payload = _request(base_url, "GET", "/health")
+    assert status == 200 and json.loads(payload)["status"] == "ok"
+    status, payload = _request(base_url, "GET", "/metrics")
+    assert status == 200 and "batching" in json.loads(payload)
+
+
+def test_translation_failure_is_500(base_url, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("modell hiba")
+
+    monkeypatch.setattr(main, "translate_blocks", broken)
+    assert _request(base_url, "POST", "/translate", SRT.encode("utf-8"))[0] == 500
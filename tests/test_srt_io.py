@@ -0,0 +1,37 @@
+import main
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nHello there.\n\n2\n00:00:02,000 --> 00:00:04,000\nThis is\ntwo lines.\n"
+
+
+def _blocks(path):
+    return [(b["index"], b["timestamp"], b["text"]) for b in main.iter_srt(path)]
+
+
+def test_bom_and_line_endings(tmp_path):
+    expected = [(1, "00:00:01,000 --> 00:00:02,000", "Hello there."),
+                (2, "00:00:02,000 --> 00:00:04,000", "This is two lines.")]
+    for name, newline in (("lf", "\n"), ("crlf", "\r\n"), ("cr", "\r")):
+        path = tmp_path / f"{name}.srt"
+        path.write_bytes(("\ufeff" + SRT).replace("\n", newline).encode("utf-8"))
+        assert _blocks(path) == expected, name
+
+
+def test_blank_lines_and_missing_final_newline(tmp_path):
+    path = tmp_path / "messy.srt"
+    path.write_text("\n\n" + SRT.replace("\n\n", "\n\n\n\n").rstrip("\n"), encoding="utf-8")
+    assert [index for index, _, _ in _blocks(path)] == [1, 2]
+
+
+def test_iter_srt_is_lazy(tmp_path):
+    path = tmp_path / "a.srt"
+    path.write_text(SRT, encoding="utf-8")
+    blocks = main.iter_srt(path)
+    assert next(blocks)["index"] == 1
+
+
+def test_streamed_segmentation_matches_list(tmp_path):
+    blocks = [{"index": i + 1, "timestamp": "", "text": f"Part {i} of a sentence" + (". " if i % 3 == 2 else "")}
+              for i in range(50)]
+    expected = main.segment_transcript(blocks, window_blocks=len(blocks))
+    for window in (1, 2, 5):
+        assert main.segment_transcript(iter(blocks), window_blocks=window) == expected
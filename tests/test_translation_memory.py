@@ -0,0 +1,69 @@
+import itertools
+
+import pytest
+
+import main
+import translation_memory
+from instrumentation import RunStats
+from translation_memory import SentenceMemo, TranslationMemory
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    # szigorúan növekvő "óra", hogy az LRU sorrend determinisztikus legyen
+    clock = itertools.count(1)
+    monkeypatch.setattr(translation_memory.time, "time", lambda: next(clock))
+    tm = TranslationMemory(tmp_path / "tm.sqlite3", max_entries=2)
+    yield tm
+    tm.close()
+
+
+def test_hit_and_miss(memory):
+    memory.put_many([("Hello.", "Szia.")], "en-hu", "1.9")
+    assert memory.get_many(["Hello.", "Bye."], "en-hu", "1.9") == {"Hello.": "Szia."}
+    assert (memory.hits, memory.misses) == (1, 1)
+
+
+def test_other_model_version_misses(memory):
+    memory.put_many([("Hello.", "Szia.")], "en-hu", "1.9")
+    assert memory.get_many(["Hello."], "en-hu", "2.0") == {}
+    assert memory.misses == 1
+
+
+def test_least_recently_used_is_evicted(memory):
+    memory.put_many([("a", "A"), ("b", "B")], "en-hu", "1.9")
+    memory.get_many(["a"], "en-hu", "1.9")  # "a" frissebb lesz, mint "b"
+    memory.put_many([("c", "C")], "en-hu", "1.9")
+    assert memory.get_many(["a", "b", "c"], "en-hu", "1.9") == {"a": "A", "c": "C"}
+    assert memory.evictions == 1
+
+
+def test_persists_across_connections(tmp_path):
+    path = tmp_path / "tm.sqlite3"
+    first = TranslationMemory(path)
+    first.put_many([("Hello.", "Szia.")], "en-hu", "1.9")
+    first.close()
+    second = TranslationMemory(path)
+    assert second.get_many(["Hello."], "en-hu", "1.9") == {"Hello.": "Szia."}
+    second.close()
+
+
+def test_translate_batch_skips_known_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "_translation_memory", TranslationMemory(tmp_path / "tm.sqlite3"))
+    first = RunStats(timing=False)
+    translations = main.translate_batch(["Hello there.", "See you."], first)
+    second = RunStats(timing=False)
+    assert main.translate_batch(["See you.", "Hello there."], second) == translations[::-1]
+    assert (first.get("memory_hits"), first.get("memory_misses")) == (0, 2)
+    assert (second.get("memory_hits"), second.get("memory_misses")) == (2, 0)
+    assert second.get("translator_calls") == 0
+    main.get_translation_memory().close()
+
+
+def test_sentence_memo_lru():
+    memo = SentenceMemo(max_entries=2)
+    memo.put_many([("a", ["▁A"]), ("b", ["▁B"])])
+    assert memo.get("a") == ["▁A"]  # "a" frissebb lesz, mint "b"
+    memo.put_many([("c", ["▁C"])])
+    assert memo.get("b") is None
+    assert (len(memo), memo.hits, memo.misses) == (2, 1, 1)
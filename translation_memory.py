@@ -0,0 +1,142 @@
+import collections
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+# ----------------------------
+# Perzisztens fordítási memória (SQLite)
+# ----------------------------
+class TranslationMemory:
+    """
+    Lemezen tárolt fordítási memória. A kulcs a védett (§...§) forrásszöveg,
+    a nyelvpár és a telepített argos modellcsomag verziója. Méretkorlátos:
+    ha a bejegyzések száma túllépi a max_entries értéket, a legrégebben
+    használt bejegyzéseket töröljük (LRU). Szálbiztos: a kapcsolatot egy
+    zár védi, így a szerver mód kéréskezelő szálai is használhatják.
+    """
+
+    def __init__(self, db_path, max_entries=200_000):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # több munkafolyamat is írhat; szálak között a zár sorosít
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tm ("
+            " source TEXT NOT NULL,"
+            " lang_pair TEXT NOT NULL,"
+            " model_version TEXT NOT NULL,"
+            " target TEXT NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (source, lang_pair, model_version))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS tm_last_used ON tm (last_used)")
+        self.conn.commit()
+
+    def get_many(self, sources, lang_pair, model_version):
+        """Visszaadja a {forrás: fordítás} találatokat, és frissíti a használati időt."""
+        with self._lock:
+            found = {}
+            unique = list(dict.fromkeys(sources))
+            # SQLite paraméterlimit miatt szeletekben kérdezünk
+            for i in range(0, len(unique), 500):
+                part = unique[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self.conn.execute(
+                    f"SELECT source, target FROM tm WHERE lang_pair = ? AND model_version = ?"
+                    f" AND source IN ({placeholders})",
+                    [lang_pair, model_version, *part],
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                now = time.time()
+                self.conn.executemany(
+                    "UPDATE tm SET last_used = ? WHERE source = ? AND lang_pair = ? AND model_version = ?",
+                    [(now, source, lang_pair, model_version) for source in found],
+                )
+                self.conn.commit()
+
+        for source in sources:
+            if source in found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+
+    def put_many(self, pairs, lang_pair, model_version):
+        """(forrás, fordítás) párok mentése, majd szükség esetén LRU-kiürítés."""
+        with self._lock:
+            now = time.time()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tm (source, lang_pair, model_version, target, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(source, lang_pair, model_version, target, now) for source, target in pairs],
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        count = self.conn.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        self.conn.execute(
+            "DELETE FROM tm WHERE rowid IN (SELECT rowid FROM tm ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self.evictions += excess
+
+    def summary(self):
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0.0
+        return (f"{self.hits} találat, {self.misses} hiány ({ratio:.1f}%), "
+                f"{self.evictions} kiürített bejegyzés")
+
+    def close(self):
+        self.conn.close()
+
+
+# ----------------------------
+# Folyamaton belüli mondatszintű memó (dekóder kimenetek)
+# ----------------------------
+class SentenceMemo:
+    """
+    Méretkorlátos (LRU) védett mondat -> dekóder kimenet (tokenek) tár.
+    A CTranslate2 beam search determinisztikus, így egy már dekódolt mondat
+    (pl. a felezéses újrapróbák feleiben) újra dekódolva ugyanazt adná.
+    """
+
+    def __init__(self, max_entries=100_000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def get(self, sentence):
+        value = self._entries.get(sentence)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(sentence)
+        self.hits += 1
+        return value
+
+    def put_many(self, pairs):
+        for sentence, value in pairs:
+            self._entries[sentence] = value
+            self._entries.move_to_end(sentence)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)